@@ -5,13 +5,55 @@ WebSocket-based API for voice interaction
 
 import asyncio
 import json
+import os
+import queue
+import struct
 import numpy as np
-from typing import Dict, Any
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Any, Tuple
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 from src.pipeline import VoicePipeline, PipelineConfig
+from src.audio.kernels import i16_to_f32
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available, using stdlib json")
+
+try:
+    import av
+    from aiortc import RTCPeerConnection, RTCSessionDescription
+    from aiortc.mediastreams import MediaStreamError
+    AIORTC_AVAILABLE = True
+except ImportError:
+    AIORTC_AVAILABLE = False
+    logger.warning("aiortc not available, WebRTC audio ingress disabled")
+
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+else:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Binary audio frame header: type, flags, sequence, timestamp (ms)
+AUDIO_FRAME_HEADER = struct.Struct("<BBHI")
+FRAME_TYPE_PCM16 = 1
+
+# Static prefix for the transcription hot path
+_TRANSCRIPTION_PREFIX = b'{"type":"transcription","text":'
 
 
 # Create FastAPI app
@@ -33,6 +75,133 @@ app.add_middleware(
 # Active pipelines
 active_pipelines: Dict[str, VoicePipeline] = {}
 
+# WebRTC peer connections by session
+peer_connections: Dict[str, Any] = {}
+
+# Warm pipelines kept loaded and checked out per WebSocket session
+PIPELINE_POOL_SIZE = int(os.getenv("PIPELINE_POOL_SIZE", "2"))
+
+# Audio intake bounds (frames); the oldest audio is dropped when full
+AUDIO_QUEUE_SIZE = 16
+AUDIO_BACKLOG_SIZE = 256
+
+# Audio frames dropped under overload since startup
+ingress_stats: Dict[str, int] = {"dropped_frames": 0}
+
+# Per-session audio intake (queue, stats) shared by WebSocket and WebRTC
+session_audio: Dict[str, Tuple[asyncio.Queue, Dict[str, int]]] = {}
+
+
+class Float32Pool:
+    """Per-size pool of reusable float32 audio buffers"""
+    
+    def __init__(self, max_per_size: int = 8):
+        """
+        Initialize buffer pool
+        
+        Args:
+            max_per_size: Maximum idle buffers kept for each size
+        """
+        self.max_per_size = max_per_size
+        self._pools: Dict[int, queue.SimpleQueue] = {}
+    
+    def acquire(self, size: int) -> np.ndarray:
+        """Get a float32 buffer of the given size"""
+        pool = self._pools.get(size)
+        if pool is not None:
+            try:
+                return pool.get_nowait()
+            except queue.Empty:
+                pass
+        
+        return np.empty(size, dtype=np.float32)
+    
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer to the pool"""
+        n = len(buffer)
+        pool = self._pools.get(n)
+        if pool is None:
+            pool = self._pools.setdefault(n, queue.SimpleQueue())
+        if pool.qsize() < self.max_per_size:
+            pool.put(buffer)
+
+
+# Shared pool for WebSocket audio ingress
+audio_pool = Float32Pool()
+
+
+@lru_cache(maxsize=1)
+def default_ws_config() -> PipelineConfig:
+    """Shared pipeline configuration for WebSocket sessions"""
+    return PipelineConfig(
+        sample_rate=16000,
+        chunk_size=1024,
+        enable_vad=True,
+        enable_streaming=True
+    )
+
+
+async def send_json_fast(websocket: WebSocket, obj: Dict[str, Any]) -> None:
+    """Send a JSON message as a binary (UTF-8) frame"""
+    await websocket.send_bytes(_json_dumps(obj))
+
+
+@app.on_event("startup")
+async def create_worker_pools():
+    """Create the executor for blocking STT/TTS work"""
+    app.state.stt_pool = ThreadPoolExecutor(
+        max_workers=os.cpu_count(),
+        thread_name_prefix="STTWorker"
+    )
+
+
+@app.on_event("startup")
+async def warm_pipeline_pool():
+    """Load pipelines up front so sessions don't pay for model loading"""
+    app.state.pipeline_pool = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    
+    for _ in range(PIPELINE_POOL_SIZE):
+        pipeline = VoicePipeline(config=default_ws_config())
+        await loop.run_in_executor(app.state.stt_pool, pipeline.initialize_components)
+        app.state.pipeline_pool.put_nowait(pipeline)
+    
+    logger.info(f"Pipeline pool ready: {PIPELINE_POOL_SIZE} warm pipelines")
+
+
+@app.on_event("shutdown")
+async def shutdown_worker_pools():
+    """Shut down the STT/TTS executor"""
+    app.state.stt_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def process_audio(
+    pipeline: VoicePipeline,
+    audio_array: np.ndarray,
+    gate: asyncio.Semaphore
+) -> None:
+    """
+    Run pipeline audio processing on the STT worker pool
+    
+    If the caller is cancelled, this still waits for the job to finish
+    (executor threads can't be interrupted), so the caller never recycles
+    audio_array or the pipeline while a worker thread is using them.
+    """
+    loop = asyncio.get_running_loop()
+    
+    # One job per session at a time to preserve ordering
+    async with gate:
+        job = loop.run_in_executor(
+            app.state.stt_pool,
+            pipeline.process_audio_chunk,
+            audio_array
+        )
+        try:
+            await asyncio.shield(job)
+        except asyncio.CancelledError:
+            await asyncio.wait((job,))
+            raise
+
 
 @app.get("/")
 async def root():
@@ -49,7 +218,8 @@ async def health():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "active_sessions": len(active_pipelines)
+        "active_sessions": len(active_pipelines),
+        "dropped_frames": ingress_stats["dropped_frames"]
     }
 
 
@@ -63,6 +233,77 @@ async def list_models():
     }
 
 
+async def ws_sender(websocket: WebSocket, tx_queue: asyncio.Queue) -> None:
+    """Send serialized pipeline events to the client in FIFO order"""
+    while True:
+        payload = await tx_queue.get()
+        await websocket.send_bytes(payload)
+
+
+def _drop_frame(audio_array: np.ndarray, session_stats: Dict[str, int]) -> None:
+    """Return a dropped frame to the pool and count it"""
+    audio_pool.release(audio_array)
+    session_stats["dropped_frames"] += 1
+    ingress_stats["dropped_frames"] += 1
+
+
+def _enqueue_audio(
+    audio_queue: asyncio.Queue,
+    audio_i16,
+    session_stats: Dict[str, int]
+) -> None:
+    """
+    Convert int16 PCM into a pooled buffer and hand it to the STT consumer
+    
+    The buffer is released by the consumer. Under overload the oldest
+    queued frame is dropped instead of blocking the receiver.
+    """
+    audio_array = audio_pool.acquire(len(audio_i16))
+    i16_to_f32(audio_i16, audio_array)
+    
+    try:
+        audio_queue.put_nowait(audio_array)
+    except asyncio.QueueFull:
+        _drop_frame(audio_queue.get_nowait(), session_stats)
+        audio_queue.put_nowait(audio_array)
+
+
+async def stt_worker(
+    pipeline: VoicePipeline,
+    audio_queue: asyncio.Queue,
+    gate: asyncio.Semaphore,
+    session_stats: Dict[str, int]
+) -> None:
+    """
+    Consume received audio and feed it to the pipeline in FIFO order
+    
+    When interruption is disabled, decoding is held back while the
+    assistant is still speaking and the audio is accumulated until the
+    reply has finished. With interruption enabled the audio has to reach
+    the VAD during playback, so it is decoded immediately. The held-back
+    audio is capped at AUDIO_BACKLOG_SIZE frames, dropping the oldest.
+    """
+    pending = []
+    
+    while True:
+        pending.append(await audio_queue.get())
+        
+        if pipeline.is_speaking and not pipeline.config.enable_interruption:
+            if len(pending) > AUDIO_BACKLOG_SIZE:
+                _drop_frame(pending.pop(0), session_stats)
+            continue
+        
+        for audio_array in pending:
+            try:
+                await process_audio(pipeline, audio_array, gate)
+            except Exception as e:
+                logger.error(f"Error processing audio: {e}")
+            finally:
+                audio_pool.release(audio_array)
+        
+        pending.clear()
+
+
 @app.websocket("/ws/voice")
 async def voice_websocket(websocket: WebSocket):
     """WebSocket endpoint for voice interaction"""
@@ -71,52 +312,81 @@ async def voice_websocket(websocket: WebSocket):
     
     logger.info(f"WebSocket connection established: {session_id}")
     
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIO_QUEUE_SIZE)
+    session_stats = {"dropped_frames": 0}
+    gate = asyncio.Semaphore(1)
+    session_audio[session_id] = (audio_queue, session_stats)
+    tx_queue: asyncio.Queue = asyncio.Queue()
+    consumer = None
+    sender = None
+    pipeline = None
+    
     try:
-        # Initialize pipeline
-        config = PipelineConfig(
-            sample_rate=16000,
-            chunk_size=1024,
-            enable_vad=True,
-            enable_streaming=True
-        )
-        
-        pipeline = VoicePipeline(config=config)
+        # Check out a warm pipeline (waits while all are in use)
+        pipeline = await app.state.pipeline_pool.get()
+        pipeline.reset_session(session_id)
         active_pipelines[session_id] = pipeline
         
-        # Setup callbacks
-        async def send_transcription(text: str):
-            await websocket.send_json({
-                "type": "transcription",
-                "text": text
-            })
+        # Setup callbacks (fired from pipeline threads; serialize there and
+        # hand the bytes to the single sender task on the event loop)
+        enqueue = partial(asyncio.get_running_loop().call_soon_threadsafe, tx_queue.put_nowait)
         
-        async def send_response(response):
-            await websocket.send_json({
+        def send_transcription(text: str):
+            enqueue(_TRANSCRIPTION_PREFIX + _json_dumps(text) + b"}")
+        
+        def send_response(response):
+            enqueue(_json_dumps({
                 "type": "response",
                 "text": response.text,
                 "intent": response.intent,
                 "confidence": response.confidence
-            })
+            }))
         
-        pipeline.on_transcription = lambda text: asyncio.create_task(send_transcription(text))
-        pipeline.on_response = lambda response: asyncio.create_task(send_response(response))
+        pipeline.on_transcription = send_transcription
+        pipeline.on_response = send_response
+        sender = asyncio.create_task(ws_sender(websocket, tx_queue))
         
-        # Initialize and start pipeline
-        pipeline.initialize_components()
+        # Decode audio in FIFO order, decoupled from receiving it
+        consumer = asyncio.create_task(stt_worker(pipeline, audio_queue, gate, session_stats))
         
         # Send ready message
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "type": "ready",
             "session_id": session_id
         })
         
         # Handle messages
+        expected_seq = 0
+        
         while True:
             data = await websocket.receive()
             
-            if "text" in data:
-                # Text message
-                message = json.loads(data["text"])
+            # Binary frames carry audio; check them first (hot path)
+            audio_bytes = data.get("bytes")
+            
+            if audio_bytes is not None:
+                if len(audio_bytes) < AUDIO_FRAME_HEADER.size:
+                    continue
+                
+                frame_type, _flags, seq, _timestamp = AUDIO_FRAME_HEADER.unpack_from(audio_bytes)
+                
+                if frame_type != FRAME_TYPE_PCM16:
+                    logger.warning(f"Unknown frame type {frame_type} from {session_id}")
+                    continue
+                
+                if seq != expected_seq:
+                    logger.debug(f"Audio frame gap on {session_id}: expected {expected_seq}, got {seq}")
+                expected_seq = (seq + 1) & 0xFFFF
+                
+                # View the PCM payload as int16 without building an ndarray;
+                # a trailing odd byte is dropped
+                payload = memoryview(audio_bytes)[AUDIO_FRAME_HEADER.size:]
+                audio_i16 = payload[:len(payload) & ~1].cast("h")
+                _enqueue_audio(audio_queue, audio_i16, session_stats)
+            
+            elif data.get("text") is not None:
+                # Control message
+                message = _json_loads(data["text"])
                 
                 if message.get("type") == "config":
                     # Configuration message
@@ -128,26 +398,19 @@ async def voice_websocket(websocket: WebSocket):
                     
                     if command == "start":
                         pipeline.start()
-                        await websocket.send_json({"type": "status", "status": "started"})
+                        await send_json_fast(websocket, {"type": "status", "status": "started"})
                         
                     elif command == "stop":
                         pipeline.stop()
-                        await websocket.send_json({"type": "status", "status": "stopped"})
+                        await send_json_fast(websocket, {"type": "status", "status": "stopped"})
                         
                     elif command == "metrics":
                         metrics = pipeline.get_metrics()
-                        await websocket.send_json({
+                        metrics["dropped_frames"] = session_stats["dropped_frames"]
+                        await send_json_fast(websocket, {
                             "type": "metrics",
                             "data": metrics
                         })
-            
-            elif "bytes" in data:
-                # Audio data
-                audio_bytes = data["bytes"]
-                audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-                
-                # Process audio (would add to pipeline)
-                logger.debug(f"Received audio: {len(audio_array)} samples")
     
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
@@ -155,14 +418,124 @@ async def voice_websocket(websocket: WebSocket):
         logger.error(f"WebSocket error: {e}")
     finally:
         # Cleanup
-        if session_id in active_pipelines:
-            pipeline = active_pipelines[session_id]
-            pipeline.stop()
-            del active_pipelines[session_id]
+        if sender:
+            sender.cancel()
+        
+        pc = peer_connections.pop(session_id, None)
+        if pc:
+            await pc.close()
+        
+        session_audio.pop(session_id, None)
+        
+        if consumer:
+            consumer.cancel()
+            # Waits out an in-flight pipeline job before its buffer is
+            # released back to the pool
+            await asyncio.gather(consumer, return_exceptions=True)
+        
+        active_pipelines.pop(session_id, None)
+        
+        if pipeline:
+            # Holding the gate guarantees no job still runs on the pipeline
+            # before it is reset and handed to the next session
+            async with gate:
+                pipeline.stop()
+                pipeline.reset_session()
+            app.state.pipeline_pool.put_nowait(pipeline)
         
         logger.info(f"WebSocket connection closed: {session_id}")
 
 
+@app.post("/offer")
+async def webrtc_offer(offer: Dict[str, Any]):
+    """
+    WebRTC signalling endpoint for Opus audio ingress
+    
+    The client opens /ws/voice first (control messages and transcripts)
+    and then posts its SDP offer with the session_id from the "ready"
+    message. Audio received on the peer connection goes through that
+    session's audio queue, like WebSocket audio.
+    """
+    if not AIORTC_AVAILABLE:
+        raise HTTPException(status_code=501, detail="WebRTC not available")
+    
+    session_id = offer.get("session_id")
+    pipeline = active_pipelines.get(session_id)
+    intake = session_audio.get(session_id)
+    
+    if pipeline is None or intake is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session: {session_id}")
+    
+    # Replace any previous connection for this session
+    old_pc = peer_connections.pop(session_id, None)
+    if old_pc:
+        await old_pc.close()
+    
+    pc = RTCPeerConnection()
+    peer_connections[session_id] = pc
+    
+    @pc.on("track")
+    def on_track(track):
+        if track.kind == "audio":
+            asyncio.ensure_future(_consume_audio_track(track, pipeline, *intake))
+    
+    @pc.on("connectionstatechange")
+    async def on_connectionstatechange():
+        if pc.connectionState in ("failed", "closed"):
+            await pc.close()
+            if peer_connections.get(session_id) is pc:
+                del peer_connections[session_id]
+    
+    await pc.setRemoteDescription(
+        RTCSessionDescription(sdp=offer["sdp"], type=offer["type"])
+    )
+    answer = await pc.createAnswer()
+    await pc.setLocalDescription(answer)
+    
+    logger.info(f"WebRTC connection established: {session_id}")
+    
+    return {
+        "sdp": pc.localDescription.sdp,
+        "type": pc.localDescription.type
+    }
+
+
+async def _consume_audio_track(
+    track,
+    pipeline: VoicePipeline,
+    audio_queue: asyncio.Queue,
+    session_stats: Dict[str, int]
+) -> None:
+    """Decode a WebRTC audio track into the session's audio queue"""
+    # Opus decodes at 48kHz; convert to the pipeline's mono int16 format
+    resampler = av.AudioResampler(
+        format="s16",
+        layout="mono",
+        rate=pipeline.config.sample_rate
+    )
+    
+    while True:
+        try:
+            frame = await track.recv()
+        except MediaStreamError:
+            break
+        
+        for resampled in resampler.resample(frame):
+            # Same bounded drop-oldest intake and speaking hold-back as
+            # WebSocket audio (stt_worker)
+            _enqueue_audio(audio_queue, resampled.to_ndarray().reshape(-1), session_stats)
+    
+    logger.debug("WebRTC audio track ended")
+
+
+@app.on_event("shutdown")
+async def close_peer_connections():
+    """Close all WebRTC peer connections"""
+    for pc in list(peer_connections.values()):
+        await pc.close()
+    peer_connections.clear()
+
+
 @app.post("/api/transcribe")
 async def transcribe_audio(audio_data: Dict[str, Any]):
     """Transcribe audio data"""
@@ -186,13 +559,26 @@ async def synthesize_speech(text_data: Dict[str, Any]):
 
 
 if __name__ == "__main__":
+    import importlib.util
+    import sys
     import uvicorn
     
     logger.info("Starting Real-Time Voice Assistant API Server...")
     
+    # libuv event loop and C HTTP parser when installed (no uvloop on Windows)
+    use_uvloop = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+    use_httptools = importlib.util.find_spec("httptools") is not None
+    
+    if not use_uvloop:
+        logger.warning("uvloop not available, using the default asyncio loop")
+    
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=8000,
-        log_level="info"
+        log_level="info",
+        loop="uvloop" if use_uvloop else "asyncio",
+        http="httptools" if use_httptools else "h11",
+        ws="websockets",
+        backlog=512
     )
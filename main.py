@@ -4,15 +4,23 @@ Zero-latency voice interface implementation
 """
 
 import argparse
+import asyncio
+import signal
 import sys
-import time
 import yaml
 from pathlib import Path
+from typing import Any
 from loguru import logger
 
 from src.pipeline import VoicePipeline, PipelineConfig
 from src.applications.language_learning import LanguageLearningApp
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+    logger.warning("PyYAML built without libyaml, using the pure-Python loader")
+
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Setup logging configuration"""
@@ -39,24 +47,46 @@ def load_config(config_path: str) -> dict:
         return {}
     
     with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YamlLoader)
     
     logger.info(f"Loaded configuration from {config_path}")
     return config
 
 
+def pick(config: dict, path: str, default: Any) -> Any:
+    """
+    Look up a dotted path in a nested config dict
+    
+    Args:
+        config: Configuration dictionary
+        path: Dotted key path (e.g. "audio.input.sample_rate")
+        default: Value returned when any key is missing
+        
+    Returns:
+        Configured value or default
+    """
+    value = config
+    for key in path.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+    return default if value is None else value
+
+
 def run_general_assistant(config: dict) -> None:
     """Run general voice assistant mode"""
     logger.info("Starting General Voice Assistant")
     
     # Create pipeline configuration
     pipeline_config = PipelineConfig(
-        sample_rate=config.get('audio', {}).get('input', {}).get('sample_rate', 16000),
-        chunk_size=config.get('audio', {}).get('input', {}).get('chunk_size', 1024),
-        enable_vad=config.get('vad', {}).get('enabled', True),
-        enable_streaming=config.get('stt', {}).get('streaming', True),
-        max_latency_ms=config.get('pipeline', {}).get('processing', {}).get('max_latency_ms', 200),
-        enable_interruption=config.get('pipeline', {}).get('interruption', {}).get('enabled', True)
+        sample_rate=pick(config, 'audio.input.sample_rate', 16000),
+        chunk_size=pick(config, 'audio.input.chunk_size', 1024),
+        enable_vad=pick(config, 'vad.enabled', True),
+        vad_backend=pick(config, 'vad.backend', 'webrtc'),
+        vad_model_path=pick(config, 'vad.model_path', None),
+        enable_streaming=pick(config, 'stt.streaming', True),
+        tts_compute_type=pick(config, 'tts.optimization.compute_type', 'float32'),
+        max_latency_ms=pick(config, 'pipeline.processing.max_latency_ms', 200),
+        audio_thread_cpu=pick(config, 'pipeline.processing.audio_thread_cpu', None),
+        enable_interruption=pick(config, 'pipeline.interruption.enabled', True)
     )
     
     # Initialize pipeline
@@ -73,8 +103,8 @@ def run_general_assistant(config: dict) -> None:
     pipeline.on_response = on_response
     
     # Initialize components
-    stt_model = config.get('stt', {}).get('model', 'base.en')
-    tts_engine = config.get('tts', {}).get('engine', 'pyttsx3')
+    stt_model = pick(config, 'stt.model', 'base.en')
+    tts_engine = pick(config, 'tts.engine', 'pyttsx3')
     
     pipeline.initialize_components(
         stt_model=stt_model,
@@ -89,15 +119,8 @@ def run_general_assistant(config: dict) -> None:
     logger.info("Press Ctrl+C to stop")
     
     try:
-        # Keep running
-        while True:
-            time.sleep(1)
-            
-            # Print metrics every 30 seconds
-            if int(time.time()) % 30 == 0:
-                metrics = pipeline.get_metrics()
-                logger.info(f"Metrics: {metrics}")
-                
+        asyncio.run(_wait_for_shutdown(pipeline))
+        logger.info("Stopping voice assistant...")
     except KeyboardInterrupt:
         logger.info("Stopping voice assistant...")
     finally:
@@ -105,6 +128,32 @@ def run_general_assistant(config: dict) -> None:
         logger.info("Voice assistant stopped")
 
 
+async def _wait_for_shutdown(pipeline: VoicePipeline, metrics_interval: float = 30.0) -> None:
+    """
+    Log pipeline metrics on a fixed interval until a shutdown signal arrives
+    
+    Args:
+        pipeline: Running voice pipeline
+        metrics_interval: Seconds between metrics reports
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: fall back to KeyboardInterrupt
+            pass
+    
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=metrics_interval)
+        except asyncio.TimeoutError:
+            metrics = pipeline.get_metrics()
+            logger.info(f"Metrics: {metrics}")
+
+
 def run_language_learning(config: dict, language: str, level: str) -> None:
     """Run language learning mode"""
     logger.info(f"Starting Language Learning Assistant - {language} ({level})")
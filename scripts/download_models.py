@@ -4,12 +4,16 @@ Download and setup required models for the voice assistant
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from loguru import logger
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Parallel downloads (network I/O releases the GIL)
+MAX_DOWNLOAD_WORKERS = 4
+
 
 def download_whisper_models():
     """Download Whisper models"""
@@ -20,10 +24,16 @@ def download_whisper_models():
         
         models = ["tiny.en", "base.en", "small.en"]
         
-        for model_name in models:
+        def download(model_name):
             logger.info(f"Downloading {model_name}...")
-            whisper.load_model(model_name)
-            logger.info(f"✓ {model_name} downloaded")
+            # Only the cached checkpoint is needed, drop the loaded model
+            whisper.load_model(model_name, device="cpu")
+            return model_name
+        
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+            futures = [executor.submit(download, name) for name in models]
+            for future in as_completed(futures):
+                logger.info(f"✓ {future.result()} downloaded")
         
         logger.info("Whisper models downloaded successfully")
         
@@ -42,11 +52,16 @@ def download_spacy_models():
         
         models = ["en_core_web_sm", "es_core_news_sm"]
         
-        for model_name in models:
+        def download(model_name):
             logger.info(f"Downloading {model_name}...")
             subprocess.run([sys.executable, "-m", "spacy", "download", model_name], 
                          check=True, capture_output=True)
-            logger.info(f"✓ {model_name} downloaded")
+            return model_name
+        
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+            futures = [executor.submit(download, name) for name in models]
+            for future in as_completed(futures):
+                logger.info(f"✓ {future.result()} downloaded")
         
         logger.info("spaCy models downloaded successfully")
         
@@ -2,6 +2,7 @@
 Profile pipeline performance and identify bottlenecks
 """
 
+import statistics
 import sys
 import time
 import numpy as np
@@ -14,6 +15,33 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.pipeline import VoicePipeline, PipelineConfig
 
 
+def bench(fn, *args, n: int = 50):
+    """
+    Time a callable over repeated runs
+    
+    Args:
+        fn: Callable to time
+        *args: Arguments passed to fn
+        n: Number of timed runs (after one warm-up call)
+        
+    Returns:
+        Tuple of (median_ms, p95_ms, last_result)
+    """
+    result = fn(*args)  # warm-up
+    
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        timings.append(time.perf_counter_ns() - start)
+    
+    timings.sort()
+    median_ms = statistics.median(timings) / 1e6
+    p95_ms = timings[min(len(timings) - 1, int(0.95 * len(timings)))] / 1e6
+    
+    return median_ms, p95_ms, result
+
+
 def profile_components():
     """Profile individual components"""
     logger.info("Profiling pipeline components...")
@@ -35,54 +63,43 @@ def profile_components():
     
     # Test audio processing
     print("Testing Audio Processing...")
-    audio_data = np.random.randn(16000).astype(np.float32)  # 1 second
+    rng = np.random.default_rng(0)
+    audio_data = rng.standard_normal(16000, dtype=np.float32)  # 1 second
     
-    start = time.time()
-    processed = pipeline.audio_processor.process(audio_data)
-    audio_time = (time.time() - start) * 1000
-    print(f"  ✓ Audio processing: {audio_time:.2f}ms")
+    audio_time, audio_p95, processed = bench(pipeline.audio_processor.process, audio_data)
+    print(f"  ✓ Audio processing: {audio_time:.2f}ms (p95 {audio_p95:.2f}ms)")
     
     # Test VAD
     print("\nTesting Voice Activity Detection...")
-    start = time.time()
-    is_speech = pipeline.vad.is_speech(audio_data[:480])  # 30ms frame
-    vad_time = (time.time() - start) * 1000
-    print(f"  ✓ VAD processing: {vad_time:.2f}ms")
+    vad_time, vad_p95, is_speech = bench(pipeline.vad.is_speech, audio_data[:480])  # 30ms frame
+    print(f"  ✓ VAD processing: {vad_time:.2f}ms (p95 {vad_p95:.2f}ms)")
     
-    # Test STT
+    # Test STT (model inference, fewer runs)
     print("\nTesting Speech-to-Text...")
-    start = time.time()
-    result = pipeline.stt.transcribe(audio_data)
-    stt_time = (time.time() - start) * 1000
-    print(f"  ✓ STT processing: {stt_time:.2f}ms")
+    stt_time, stt_p95, result = bench(pipeline.stt.transcribe, audio_data, n=5)
+    print(f"  ✓ STT processing: {stt_time:.2f}ms (p95 {stt_p95:.2f}ms)")
     
     # Test NLP
     print("\nTesting NLP (Intent Classification)...")
     test_text = "Hello, how are you?"
-    start = time.time()
-    intent = pipeline.intent_classifier.classify(test_text)
-    nlp_time = (time.time() - start) * 1000
-    print(f"  ✓ NLP processing: {nlp_time:.2f}ms")
+    nlp_time, nlp_p95, intent = bench(pipeline.intent_classifier.classify, test_text)
+    print(f"  ✓ NLP processing: {nlp_time:.2f}ms (p95 {nlp_p95:.2f}ms)")
     
     # Test Response Generation
     print("\nTesting Response Generation...")
-    start = time.time()
-    response = pipeline.response_generator.generate(intent.name)
-    response_time = (time.time() - start) * 1000
-    print(f"  ✓ Response generation: {response_time:.2f}ms")
+    response_time, response_p95, response = bench(pipeline.response_generator.generate, intent.name)
+    print(f"  ✓ Response generation: {response_time:.2f}ms (p95 {response_p95:.2f}ms)")
     
-    # Test TTS
+    # Test TTS (synthesis, fewer runs)
     print("\nTesting Text-to-Speech...")
-    start = time.time()
-    audio = pipeline.tts.synthesize("Hello, this is a test.")
-    tts_time = (time.time() - start) * 1000
-    print(f"  ✓ TTS synthesis: {tts_time:.2f}ms")
+    tts_time, tts_p95, audio = bench(pipeline.tts.synthesize, "Hello, this is a test.", n=5)
+    print(f"  ✓ TTS synthesis: {tts_time:.2f}ms (p95 {tts_p95:.2f}ms)")
     
     # Calculate total pipeline latency
     total_latency = audio_time + vad_time + stt_time + nlp_time + response_time + tts_time
     
     print("\n" + "="*60)
-    print("  SUMMARY")
+    print("  SUMMARY (median)")
     print("="*60)
     print(f"Audio Processing:    {audio_time:7.2f}ms ({audio_time/total_latency*100:5.1f}%)")
     print(f"VAD:                 {vad_time:7.2f}ms ({vad_time/total_latency*100:5.1f}%)")
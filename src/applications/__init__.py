@@ -1,5 +1,6 @@
 """Voice assistant applications"""
 
 from .language_learning import LanguageLearningApp
+from .pronunciation import PronunciationScorer
 
-__all__ = ["LanguageLearningApp"]
+__all__ = ["LanguageLearningApp", "PronunciationScorer"]
@@ -3,13 +3,72 @@ Language Learning Application
 Real-time language practice partner with instant feedback
 """
 
-import time
+import asyncio
+import itertools
 import random
-from typing import Dict, Any, Optional
+import signal
+import numpy as np
+from typing import Dict, Any, Iterator, Optional
 from loguru import logger
 
 from ..pipeline import VoicePipeline, PipelineConfig
 from ..nlp import Intent
+from .pronunciation import PronunciationScorer
+
+
+# Practice scenarios (shared, read-only)
+SCENARIOS = {
+    "greetings": {
+        "description": "Basic greetings and introductions",
+        "difficulty": "beginner",
+        "prompts": [
+            "Hello! How are you?",
+            "Nice to meet you. What's your name?",
+            "How was your day?"
+        ]
+    },
+    "ordering_food": {
+        "description": "Ordering at a restaurant",
+        "difficulty": "intermediate",
+        "prompts": [
+            "Welcome to our restaurant! What would you like to order?",
+            "Would you like something to drink?",
+            "Will that be for here or to go?"
+        ]
+    },
+    "job_interview": {
+        "description": "Job interview practice",
+        "difficulty": "advanced",
+        "prompts": [
+            "Tell me about yourself and your experience.",
+            "What are your greatest strengths?",
+            "Why do you want to work here?"
+        ]
+    }
+}
+# Scenario ticks (1 s each) between practice prompts
+SCENARIO_PROMPT_INTERVAL = 10
+
+# Target language -> STT language code
+_LANGUAGE_CODES = {
+    "spanish": "es",
+    "french": "fr",
+    "german": "de",
+    "italian": "it",
+    "portuguese": "pt",
+    "chinese": "zh",
+    "japanese": "ja",
+    "korean": "ko"
+}
+
+
+# Encouragement shown every few exchanges
+_FEEDBACK_MESSAGES = (
+    "You're doing great! Keep practicing!",
+    "Good job! Your pronunciation is improving.",
+    "Excellent! You're making good progress.",
+    "Well done! Try to speak a bit more naturally."
+)
 
 
 class LanguageLearningApp:
@@ -37,39 +96,22 @@ class LanguageLearningApp:
         self.pipeline: Optional[VoicePipeline] = None
         
         # Scenarios
-        self.scenarios = {
-            "greetings": {
-                "description": "Basic greetings and introductions",
-                "difficulty": "beginner",
-                "prompts": [
-                    "Hello! How are you?",
-                    "Nice to meet you. What's your name?",
-                    "How was your day?"
-                ]
-            },
-            "ordering_food": {
-                "description": "Ordering at a restaurant",
-                "difficulty": "intermediate",
-                "prompts": [
-                    "Welcome to our restaurant! What would you like to order?",
-                    "Would you like something to drink?",
-                    "Will that be for here or to go?"
-                ]
-            },
-            "job_interview": {
-                "description": "Job interview practice",
-                "difficulty": "advanced",
-                "prompts": [
-                    "Tell me about yourself and your experience.",
-                    "What are your greatest strengths?",
-                    "Why do you want to work here?"
-                ]
-            }
-        }
+        self.scenarios = SCENARIOS
         
         self.current_scenario: Optional[str] = None
         self.conversation_count = 0
         
+        # Shuffled prompt cycle for the active scenario, one prompt per N ticks
+        self._prompt_iter: Optional[Iterator[str]] = None
+        self._scenario_ticks = 0
+        
+        # Session loop and its "scenario active" wakeup (set while running)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scenario_active: Optional[asyncio.Event] = None
+        
+        # Pronunciation model (loaded in initialize() if configured)
+        self.pronunciation_scorer: Optional[PronunciationScorer] = None
+        
         # Feedback tracking
         self.pronunciation_scores = []
         self.grammar_corrections = []
@@ -98,6 +140,7 @@ class LanguageLearningApp:
         
         # Setup callbacks
         self.pipeline.on_transcription = self._on_transcription
+        self.pipeline.on_utterance = self._on_utterance
         self.pipeline.on_intent = self._on_intent
         self.pipeline.on_response = self._on_response
         
@@ -108,6 +151,20 @@ class LanguageLearningApp:
             language=self._get_language_code()
         )
         
+        # Load the pronunciation model once and reuse its session
+        model_config = self.config.get('language_learning', {}).get('pronunciation_model', {})
+        if model_config.get('path'):
+            try:
+                self.pronunciation_scorer = PronunciationScorer(
+                    model_path=model_config['path'],
+                    vocab_path=model_config['vocab'],
+                    num_threads=model_config.get('num_threads', 1)
+                )
+                self.pronunciation_scorer.initialize()
+            except Exception as e:
+                logger.warning(f"Pronunciation model unavailable, using placeholder scores: {e}")
+                self.pronunciation_scorer = None
+        
         logger.info("Language learning app initialized")
     
     def run(self) -> None:
@@ -124,18 +181,8 @@ class LanguageLearningApp:
         logger.info("Press Ctrl+C to stop")
         
         try:
-            # Keep running
-            while True:
-                time.sleep(1)
-                
-                # Check for scenario changes
-                if self.current_scenario:
-                    self._manage_scenario()
-                
-                # Print progress every minute
-                if int(time.time()) % 60 == 0:
-                    self._print_progress()
-                    
+            asyncio.run(self._run_session())
+            logger.info("Ending language learning session...")
         except KeyboardInterrupt:
             logger.info("Ending language learning session...")
         finally:
@@ -143,6 +190,70 @@ class LanguageLearningApp:
             self.pipeline.stop()
             logger.info("Language learning app stopped")
     
+    async def _run_session(self) -> None:
+        """Handle pipeline events and periodic tasks until shutdown"""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        self._loop = loop
+        self._scenario_active = asyncio.Event()
+        if self.current_scenario:
+            self._scenario_active.set()
+        
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows: fall back to KeyboardInterrupt
+                pass
+        
+        # Pipeline callbacks fire on its worker threads; queue them onto
+        # the loop so the STT/NLP/TTS stages never wait on our handlers
+        def forward(handler):
+            return lambda *args: loop.call_soon_threadsafe(events.put_nowait, (handler, args))
+        
+        self.pipeline.on_transcription = forward(self._on_transcription)
+        self.pipeline.on_utterance = forward(self._on_utterance)
+        self.pipeline.on_intent = forward(self._on_intent)
+        self.pipeline.on_response = forward(self._on_response)
+        
+        async def handle_events():
+            while True:
+                handler, args = await events.get()
+                try:
+                    handler(*args)
+                except Exception as e:
+                    logger.error(f"Error handling pipeline event: {e}")
+        
+        async def manage_scenarios():
+            # Sleep until a scenario is chosen instead of waking every second
+            await self._scenario_active.wait()
+            while True:
+                await asyncio.sleep(1)
+                self._manage_scenario()
+        
+        async def report_progress():
+            # Fixed monotonic deadlines so slow reports don't drift the cadence
+            deadline = loop.time()
+            while True:
+                deadline += 60
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+                self._print_progress()
+        
+        tasks = [
+            asyncio.create_task(handle_events()),
+            asyncio.create_task(manage_scenarios()),
+            asyncio.create_task(report_progress())
+        ]
+        
+        await stop.wait()
+        
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+    
     def _speak_welcome(self) -> None:
         """Speak welcome message"""
         welcome_messages = {
@@ -161,10 +272,26 @@ class LanguageLearningApp:
     def _on_transcription(self, text: str) -> None:
         """Handle transcription"""
         print(f"[YOU]: {text}")
+    
+    def _on_utterance(self, text: str, audio_data: np.ndarray) -> None:
+        """Handle a complete utterance with its unprocessed audio"""
+        if self._loop is None:
+            # Not forwarded to the session loop; already on a pipeline thread
+            self._record_pronunciation(self._analyze_pronunciation(text, audio_data))
+            return
         
-        # Analyze pronunciation (placeholder)
-        score = self._analyze_pronunciation(text)
-        if score < 0.7:
+        # Model inference and alignment are CPU-bound; keep them off the loop
+        future = self._loop.run_in_executor(None, self._analyze_pronunciation, text, audio_data)
+        future.add_done_callback(self._on_pronunciation_scored)
+    
+    def _on_pronunciation_scored(self, future: asyncio.Future) -> None:
+        """Record the result of an executor scoring job (on the loop)"""
+        if not future.cancelled():
+            self._record_pronunciation(future.result())
+    
+    def _record_pronunciation(self, score: Optional[float]) -> None:
+        """Keep low pronunciation scores for feedback"""
+        if score is not None and score < 0.7:
             self.pronunciation_scores.append(score)
     
     def _on_intent(self, intent: Intent) -> None:
@@ -175,7 +302,7 @@ class LanguageLearningApp:
         if intent.name == "request_scenario" and "scenario" in intent.entities:
             scenario = intent.entities["scenario"]
             if scenario in self.scenarios:
-                self.current_scenario = scenario
+                self._activate_scenario(scenario)
                 logger.info(f"Starting scenario: {scenario}")
     
     def _on_response(self, response) -> None:
@@ -188,30 +315,31 @@ class LanguageLearningApp:
         if self.conversation_count % 5 == 0:
             self._provide_feedback()
     
-    def _analyze_pronunciation(self, text: str) -> float:
+    def _analyze_pronunciation(self, text: str, audio_data: np.ndarray) -> Optional[float]:
         """
-        Analyze pronunciation quality (placeholder)
+        Analyze pronunciation quality
         
         Args:
             text: Transcribed text
+            audio_data: Unprocessed utterance audio (16 kHz float32)
             
         Returns:
-            Pronunciation score (0.0 to 1.0)
+            Pronunciation score (0.0 to 1.0), or None if nothing to score
         """
-        # This would use actual phonetic analysis in production
-        # For now, return a random score
-        return random.uniform(0.6, 1.0)
+        if self.pronunciation_scorer is None:
+            # This would use actual phonetic analysis in production
+            # For now, return a random score
+            return random.uniform(0.6, 1.0)
+        
+        try:
+            return self.pronunciation_scorer.score(text, audio_data)
+        except Exception as e:
+            logger.error(f"Error scoring pronunciation: {e}")
+            return None
     
     def _provide_feedback(self) -> None:
         """Provide learning feedback"""
-        feedback_messages = [
-            "You're doing great! Keep practicing!",
-            "Good job! Your pronunciation is improving.",
-            "Excellent! You're making good progress.",
-            "Well done! Try to speak a bit more naturally."
-        ]
-        
-        message = random.choice(feedback_messages)
+        message = random.choice(_FEEDBACK_MESSAGES)
         print(f"\n💡 FEEDBACK: {message}\n")
     
     def _manage_scenario(self) -> None:
@@ -219,13 +347,23 @@ class LanguageLearningApp:
         if not self.current_scenario:
             return
         
-        scenario = self.scenarios[self.current_scenario]
-        
-        # Occasionally prompt with scenario-specific questions
-        if random.random() < 0.1:  # 10% chance
-            prompt = random.choice(scenario["prompts"])
+        # Prompt with a scenario-specific question every 10th tick
+        self._scenario_ticks += 1
+        if self._scenario_ticks % SCENARIO_PROMPT_INTERVAL == 0:
+            prompt = next(self._prompt_iter)
             logger.debug(f"Scenario prompt: {prompt}")
     
+    def _activate_scenario(self, scenario: str) -> None:
+        """Make a scenario current and shuffle its prompt cycle once"""
+        prompts = self.scenarios[scenario]["prompts"]
+        self.current_scenario = scenario
+        self._prompt_iter = itertools.cycle(random.sample(prompts, len(prompts)))
+        self._scenario_ticks = 0
+        
+        # May be called from another thread (set_scenario), so hop onto the loop
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._scenario_active.set)
+    
     def _print_progress(self) -> None:
         """Print learning progress"""
         metrics = self.pipeline.get_metrics()
@@ -272,18 +410,7 @@ class LanguageLearningApp:
     
     def _get_language_code(self) -> str:
         """Get language code for STT"""
-        language_codes = {
-            "spanish": "es",
-            "french": "fr",
-            "german": "de",
-            "italian": "it",
-            "portuguese": "pt",
-            "chinese": "zh",
-            "japanese": "ja",
-            "korean": "ko"
-        }
-        
-        return language_codes.get(self.target_language, "en")
+        return _LANGUAGE_CODES.get(self.target_language, "en")
     
     def set_scenario(self, scenario: str) -> bool:
         """
@@ -296,7 +423,7 @@ class LanguageLearningApp:
             True if successful
         """
         if scenario in self.scenarios:
-            self.current_scenario = scenario
+            self._activate_scenario(scenario)
             scenario_data = self.scenarios[scenario]
             
             print(f"\n🎭 Starting scenario: {scenario_data['description']}")
@@ -0,0 +1,185 @@
+"""
+Pronunciation Scoring Module
+Goodness-of-pronunciation scores from a quantized CTC acoustic model
+"""
+
+import json
+import numpy as np
+from typing import Dict, Optional
+from loguru import logger
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    logger.warning("onnxruntime not available, pronunciation scoring disabled")
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _ctc_forced_align(log_probs, targets, blank):
+    """
+    Viterbi-align a target sequence to CTC log posteriors
+    
+    Args:
+        log_probs: (frames, vocab) log-softmax posteriors
+        targets: Target token ids (int64)
+        blank: Blank token id
+    
+    Returns:
+        Mean log posterior of the frames aligned to target tokens
+        (-inf if the targets don't fit in the available frames)
+    """
+    num_frames = log_probs.shape[0]
+    num_states = 2 * targets.shape[0] + 1
+    neg_inf = -np.inf
+    
+    # Extended label sequence: blank, t0, blank, t1, ..., blank
+    labels = np.full(num_states, blank, dtype=np.int64)
+    for i in range(targets.shape[0]):
+        labels[2 * i + 1] = targets[i]
+    
+    score = np.full(num_states, neg_inf)
+    back = np.zeros((num_frames, num_states), dtype=np.int8)
+    score[0] = log_probs[0, labels[0]]
+    if num_states > 1:
+        score[1] = log_probs[0, labels[1]]
+    
+    for t in range(1, num_frames):
+        prev = score.copy()
+        for s in range(num_states):
+            best = prev[s]
+            step = 0
+            if s >= 1 and prev[s - 1] > best:
+                best = prev[s - 1]
+                step = 1
+            # Skip the blank between two different tokens
+            if s >= 2 and labels[s] != blank and labels[s] != labels[s - 2] and prev[s - 2] > best:
+                best = prev[s - 2]
+                step = 2
+            score[s] = best + log_probs[t, labels[s]]
+            back[t, s] = step
+    
+    # Path must end on the last token or the trailing blank
+    s = num_states - 1
+    if num_states > 1 and score[num_states - 2] > score[s]:
+        s = num_states - 2
+    if score[s] == neg_inf:
+        return neg_inf
+    
+    # Walk back, averaging posteriors of frames on token states
+    total = 0.0
+    count = 0
+    for t in range(num_frames - 1, -1, -1):
+        if labels[s] != blank:
+            total += log_probs[t, labels[s]]
+            count += 1
+        s -= back[t, s]
+    
+    return total / count if count else neg_inf
+
+
+if NUMBA_AVAILABLE:
+    _ctc_forced_align = njit(cache=True)(_ctc_forced_align)
+
+
+class PronunciationScorer:
+    """Goodness-of-pronunciation scoring with a cached ONNX session"""
+    
+    def __init__(
+        self,
+        model_path: str,
+        vocab_path: str,
+        blank_token: str = "<pad>",
+        word_delimiter: str = "|",
+        num_threads: int = 1
+    ):
+        """
+        Initialize pronunciation scorer
+        
+        Args:
+            model_path: Path to an int8 CTC acoustic model (ONNX) that maps
+                16 kHz float32 audio (1, samples) to logits (1, frames, vocab)
+            vocab_path: JSON token -> id vocabulary of the model
+            blank_token: CTC blank token
+            word_delimiter: Token used between words
+            num_threads: ONNX Runtime intra-op threads
+        """
+        self.model_path = model_path
+        self.vocab_path = vocab_path
+        self.word_delimiter = word_delimiter
+        self.num_threads = num_threads
+        
+        with open(vocab_path, 'r', encoding='utf-8') as f:
+            self.vocab: Dict[str, int] = json.load(f)
+        self.blank_id = self.vocab[blank_token]
+        
+        self.session = None
+        self._input_name: Optional[str] = None
+        
+        logger.info(f"PronunciationScorer initialized: model={model_path}")
+    
+    def initialize(self) -> None:
+        """Load the model once; the session is reused for every utterance"""
+        if self.session is not None:
+            return
+        
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is required for pronunciation scoring")
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        self.session = ort.InferenceSession(
+            self.model_path,
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        self._input_name = self.session.get_inputs()[0].name
+        
+        logger.info("Pronunciation model loaded")
+    
+    def _encode_text(self, text: str) -> np.ndarray:
+        """Map text to model token ids (unknown characters are skipped)"""
+        ids = []
+        for char in " ".join(text.lower().split()):
+            token = self.word_delimiter if char == " " else char
+            if token in self.vocab:
+                ids.append(self.vocab[token])
+        return np.asarray(ids, dtype=np.int64)
+    
+    def score(self, text: str, audio_data: np.ndarray) -> Optional[float]:
+        """
+        Score how well an utterance matches its expected text
+        
+        Args:
+            text: Expected (transcribed) text
+            audio_data: Utterance audio at 16 kHz
+        
+        Returns:
+            Mean aligned token posterior (0.0 to 1.0), or None if the
+            text has no scorable tokens
+        """
+        if self.session is None:
+            self.initialize()
+        
+        targets = self._encode_text(text)
+        if targets.size == 0:
+            return None
+        
+        audio = np.ascontiguousarray(audio_data, dtype=np.float32).reshape(1, -1)
+        logits = self.session.run(None, {self._input_name: audio})[0][0]
+        
+        # Log-softmax over the vocabulary
+        logits = logits.astype(np.float64)
+        logits -= logits.max(axis=1, keepdims=True)
+        log_probs = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+        
+        mean_log_posterior = _ctc_forced_align(log_probs, targets, self.blank_id)
+        return float(np.exp(mean_log_posterior))
@@ -3,23 +3,36 @@ Audio Input Module
 Handles real-time audio capture with low-latency buffering
 """
 
-import queue
-import threading
+import time
 import numpy as np
 import sounddevice as sd
 from loguru import logger
 from typing import Callable, Optional
 
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+    logger.warning("webrtcvad not available, capture VAD gate disabled")
+
 
 class AudioInput:
     """Real-time audio input handler with streaming support"""
     
+    # Reader poll interval while the ring is empty (seconds)
+    POLL_INTERVAL = 0.005
+    
     def __init__(
         self,
         sample_rate: int = 16000,
         channels: int = 1,
         chunk_size: int = 1024,
-        device_index: Optional[int] = None
+        device_index: Optional[int] = None,
+        max_buffer_seconds: float = 30.0,
+        vad_gate: bool = False,
+        pre_roll_chunks: int = 2,
+        post_roll_chunks: int = 5
     ):
         """
         Initialize audio input
@@ -29,13 +42,45 @@ class AudioInput:
             channels: Number of audio channels
             chunk_size: Size of audio chunks
             device_index: Input device index (None for default)
+            max_buffer_seconds: Audio retained for read() before the oldest is dropped
+            vad_gate: Only queue chunks around detected speech
+            pre_roll_chunks: Silent chunks kept ahead of speech onset
+            post_roll_chunks: Chunks still queued after speech stops
         """
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_size = chunk_size
         self.device_index = device_index
         
-        self.audio_queue = queue.Queue()
+        # Single-producer/single-consumer ring: the audio callback only
+        # advances _head, read() only advances _tail (no locks). When the
+        # reader falls behind, the oldest audio is overwritten.
+        ring_slots = max(2, int(max_buffer_seconds * sample_rate / chunk_size))
+        self._ring = np.zeros((ring_slots, chunk_size, channels), dtype=np.int16)
+        self._lengths = np.zeros(ring_slots, dtype=np.int64)
+        self._head = 0
+        self._tail = 0
+        self.dropped_chunks = 0
+        
+        # Capture-side VAD gate (30 ms WebRTC VAD frames)
+        self._vad = None
+        if vad_gate:
+            if not WEBRTCVAD_AVAILABLE:
+                logger.warning("VAD gate requested but webrtcvad is missing")
+            elif sample_rate not in (8000, 16000, 32000, 48000):
+                logger.warning(f"VAD gate unsupported at {sample_rate}Hz")
+            else:
+                self._vad = webrtcvad.Vad(2)
+        self._vad_frame = int(sample_rate * 0.03)
+        self.post_roll_chunks = post_roll_chunks
+        self._hangover = 0
+        self._gate_open = False
+        
+        # Recent silent chunks replayed when speech starts
+        self._pre_roll = np.zeros((pre_roll_chunks, chunk_size, channels), dtype=np.int16)
+        self._pre_roll_lengths = np.zeros(pre_roll_chunks, dtype=np.int64)
+        self._pre_roll_count = 0
+        
         self.is_recording = False
         self.stream = None
         self.callbacks = []
@@ -54,13 +99,15 @@ class AudioInput:
         self.is_recording = True
         
         try:
-            self.stream = sd.InputStream(
+            # Raw stream hands the callback a cffi buffer rather than
+            # building a new ndarray for every block
+            self.stream = sd.RawInputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 blocksize=self.chunk_size,
                 device=self.device_index,
-                callback=self._audio_callback,
-                dtype=np.int16
+                callback=self._raw_callback,
+                dtype='int16'
             )
             self.stream.start()
             logger.info("Audio input started")
@@ -83,41 +130,136 @@ class AudioInput:
         
         logger.info("Audio input stopped")
     
+    def _raw_callback(self, indata, frames, time, status) -> None:
+        """Callback for the raw stream: view the buffer as int16 frames"""
+        samples = np.frombuffer(indata, dtype=np.int16).reshape(-1, self.channels)
+        self._audio_callback(samples, frames, time, status)
+    
     def _audio_callback(self, indata, frames, time, status) -> None:
-        """Callback for audio stream"""
+        """Handle a block of int16 frames shaped (frames, channels)"""
         if status:
             logger.warning(f"Audio input status: {status}")
         
-        # Copy data to prevent buffer issues
-        audio_data = indata.copy()
+        frames = min(frames, self.chunk_size)
         
-        # Add to queue for processing
-        try:
-            self.audio_queue.put_nowait(audio_data)
-        except queue.Full:
-            logger.warning("Audio queue full, dropping frame")
+        if self._vad is not None:
+            if self._contains_speech(indata, frames):
+                self._hangover = self.post_roll_chunks
+            elif self._hangover > 0:
+                self._hangover -= 1
+            else:
+                # Silence: hold as pre-roll instead of queueing
+                self._gate_open = False
+                self._hold_pre_roll(indata, frames)
+                return
+            
+            if not self._gate_open:
+                # Speech onset: queue the buffered lead-in first
+                self._gate_open = True
+                self._flush_pre_roll()
+        
+        self._publish(indata, frames)
+    
+    def _contains_speech(self, indata, frames: int) -> bool:
+        """Check the chunk for speech in 30 ms WebRTC VAD frames"""
+        mono = indata[:frames, 0]
+        
+        # Mono blocks are contiguous: slice a byte view instead of copying
+        pcm = memoryview(mono).cast('B').toreadonly() if self.channels == 1 else mono.tobytes()
+        frame_bytes = self._vad_frame * 2
+        
+        for start in range(0, len(pcm) - frame_bytes + 1, frame_bytes):
+            if self._vad.is_speech(pcm[start:start + frame_bytes], self.sample_rate):
+                return True
+        
+        return False
+    
+    def _hold_pre_roll(self, indata, frames: int) -> None:
+        """Keep the most recent silent chunks for speech onset"""
+        slots = len(self._pre_roll)
+        if slots == 0:
+            return
         
-        # Notify callbacks
+        slot_index = self._pre_roll_count % slots
+        self._pre_roll[slot_index, :frames] = indata[:frames]
+        self._pre_roll_lengths[slot_index] = frames
+        self._pre_roll_count += 1
+    
+    def _flush_pre_roll(self) -> None:
+        """Queue held pre-roll chunks oldest first"""
+        slots = len(self._pre_roll)
+        
+        for i in range(max(0, self._pre_roll_count - slots), self._pre_roll_count):
+            slot_index = i % slots
+            frames = int(self._pre_roll_lengths[slot_index])
+            self._publish(self._pre_roll[slot_index], frames)
+        
+        self._pre_roll_count = 0
+    
+    def _publish(self, indata, frames: int) -> None:
+        """Copy a chunk into the ring and make it visible to read()"""
+        num_slots = len(self._ring)
+        
+        # Copy into the preallocated slot (overwriting the oldest chunk
+        # if the reader is a full ring behind), then publish it
+        slot_index = self._head % num_slots
+        slot = self._ring[slot_index, :frames]
+        slot[:] = indata[:frames]
+        self._lengths[slot_index] = frames
+        self._head += 1
+        
+        # Notify callbacks (slot view is only valid during the call)
         for callback in self.callbacks:
             try:
-                callback(audio_data)
+                callback(slot)
             except Exception as e:
                 logger.error(f"Error in audio callback: {e}")
     
-    def read(self, timeout: float = None) -> Optional[np.ndarray]:
+    def read(self, timeout: float = None, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
-        Read audio chunk from queue
+        Read audio chunk from the ring buffer
         
         Args:
             timeout: Maximum time to wait for audio
+            out: Optional (chunk_size, channels) int16 buffer to copy into
+                instead of allocating; the result is a view of it and is
+                only valid until the next read into the same buffer
             
         Returns:
             Audio data as numpy array or None if timeout
         """
-        try:
-            return self.audio_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        num_slots = len(self._ring)
+        
+        while True:
+            while self._tail == self._head:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                time.sleep(self.POLL_INTERVAL)
+            
+            # Skip chunks the writer has lapped, keeping one slot of margin
+            tail = self._tail
+            oldest = self._head - (num_slots - 1)
+            if tail < oldest:
+                self.dropped_chunks += oldest - tail
+                tail = oldest
+            
+            slot_index = tail % num_slots
+            slot = self._ring[slot_index, :self._lengths[slot_index]]
+            if out is None:
+                audio_data = slot.copy()
+            else:
+                audio_data = out[:len(slot)]
+                np.copyto(audio_data, slot)
+            
+            # Retry if the slot was overwritten while copying
+            if self._head - tail >= num_slots:
+                self._tail = tail
+                continue
+            
+            self._tail = tail + 1
+            return audio_data
     
     def register_callback(self, callback: Callable[[np.ndarray], None]) -> None:
         """
@@ -130,12 +272,8 @@ class AudioInput:
         logger.debug(f"Registered audio callback: {callback.__name__}")
     
     def clear_queue(self) -> None:
-        """Clear audio queue"""
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        """Discard buffered audio"""
+        self._tail = self._head
     
     def get_devices(self) -> list:
         """Get list of available input devices"""
@@ -10,6 +10,8 @@ import sounddevice as sd
 from loguru import logger
 from typing import Optional
 
+from .kernels import peak_abs
+
 
 class AudioOutput:
     """Real-time audio output handler with streaming support"""
@@ -19,7 +21,8 @@ class AudioOutput:
         sample_rate: int = 22050,
         channels: int = 1,
         buffer_size: int = 2048,
-        device_index: Optional[int] = None
+        device_index: Optional[int] = None,
+        max_queued_buffers: int = 0
     ):
         """
         Initialize audio output
@@ -29,13 +32,16 @@ class AudioOutput:
             channels: Number of audio channels
             buffer_size: Size of output buffer
             device_index: Output device index (None for default)
+            max_queued_buffers: Maximum buffers queued for playback;
+                blocking writes wait for room (0 for unbounded)
         """
         self.sample_rate = sample_rate
         self.channels = channels
         self.buffer_size = buffer_size
         self.device_index = device_index
         
-        self.audio_queue = queue.Queue()
+        self.audio_queue = queue.Queue(maxsize=max_queued_buffers)
+        self._remainder = None  # unplayed tail of the current buffer
         self.is_playing = False
         self.stream = None
         self._play_thread = None
@@ -94,28 +100,33 @@ class AudioOutput:
         if status:
             logger.warning(f"Audio output status: {status}")
         
-        try:
-            # Get audio from queue
-            audio_data = self.audio_queue.get_nowait()
-            
-            # Ensure correct shape
-            if audio_data.ndim == 1:
-                audio_data = audio_data.reshape(-1, 1)
+        # Fill outdata in place from queued buffers, no allocation
+        filled = 0
+        
+        while filled < frames:
+            audio_data = self._remainder
+            self._remainder = None
             
-            # Handle size mismatch
-            if len(audio_data) < frames:
-                # Pad with zeros
-                padding = np.zeros((frames - len(audio_data), self.channels), dtype=np.float32)
-                audio_data = np.vstack([audio_data, padding])
-            elif len(audio_data) > frames:
-                # Trim excess
-                audio_data = audio_data[:frames]
+            if audio_data is None:
+                try:
+                    audio_data = self.audio_queue.get_nowait()
+                except queue.Empty:
+                    break
+                
+                if audio_data.ndim == 1:
+                    audio_data = audio_data[:, None]
             
-            outdata[:] = audio_data
+            n = min(len(audio_data), frames - filled)
+            outdata[filled:filled + n] = audio_data[:n]
+            filled += n
             
-        except queue.Empty:
-            # No audio available, output silence
-            outdata.fill(0)
+            # Keep the tail (a view) for the next callback
+            if n < len(audio_data):
+                self._remainder = audio_data[n:]
+        
+        if filled < frames:
+            # Underflow, pad with silence
+            outdata[filled:].fill(0)
     
     def write(self, audio_data: np.ndarray, block: bool = False) -> None:
         """
@@ -129,13 +140,21 @@ class AudioOutput:
         if audio_data.dtype != np.float32:
             audio_data = audio_data.astype(np.float32)
         
-        # Normalize if needed
-        if audio_data.max() > 1.0 or audio_data.min() < -1.0:
-            audio_data = audio_data / np.abs(audio_data).max()
+        # Normalize if needed (one peak pass; scaling only on overflow)
+        peak = peak_abs(audio_data)
+        if peak > 1.0:
+            audio_data = audio_data * np.float32(1.0 / peak)
         
         try:
             if block:
-                self.audio_queue.put(audio_data)
+                # Wait for playback to make room, unless the stream stops
+                while True:
+                    try:
+                        self.audio_queue.put(audio_data, timeout=0.1)
+                        break
+                    except queue.Full:
+                        if not self.is_playing:
+                            raise
             else:
                 self.audio_queue.put_nowait(audio_data)
         except queue.Full:
@@ -163,13 +182,14 @@ class AudioOutput:
         self.play(audio_data)
         
         # Wait for queue to empty
-        while not self.audio_queue.empty():
+        while not self.is_queue_empty():
             self._stop_event.wait(0.01)
             if not self.is_playing:
                 break
     
     def clear_queue(self) -> None:
         """Clear audio output queue"""
+        self._remainder = None
         while not self.audio_queue.empty():
             try:
                 self.audio_queue.get_nowait()
@@ -178,7 +198,7 @@ class AudioOutput:
     
     def is_queue_empty(self) -> bool:
         """Check if output queue is empty"""
-        return self.audio_queue.empty()
+        return self._remainder is None and self.audio_queue.empty()
     
     def get_devices(self) -> list:
         """Get list of available output devices"""
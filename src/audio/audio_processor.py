@@ -4,15 +4,33 @@ Audio preprocessing and enhancement for optimal recognition
 """
 
 import numpy as np
+from functools import lru_cache
+from math import gcd
 from scipy import signal
-from scipy.signal import butter, lfilter
+from scipy.signal import butter, firwin, sosfilt
 from loguru import logger
 from typing import Optional
 
+from .kernels import (
+    INV_32768, below_mean_square, i16_to_f32, preemphasis, peak_normalize, process_chunk, rms
+)
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """Anti-aliasing FIR taps for resample_poly (scipy's default design)"""
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps.setflags(write=False)
+    return taps
+
 
 class AudioProcessor:
     """Audio preprocessing and enhancement"""
     
+    # Noise-reduction high-pass cutoff in Hz
+    HIGHPASS_CUTOFF = 80
+    
     def __init__(
         self,
         sample_rate: int = 16000,
@@ -37,6 +55,28 @@ class AudioProcessor:
         # Noise profile (estimated from silence)
         self.noise_profile = None
         
+        # float32 constants so nothing promotes to float64
+        self._preemphasis_coeff = np.float32(0.97)
+        self._target_level = np.float32(0.9)
+        
+        # Filters depend only on the sample rate; design them once
+        nyquist = sample_rate / 2
+        self._hp_sos = None
+        if self.HIGHPASS_CUTOFF < nyquist:
+            self._hp_sos = butter(
+                4, self.HIGHPASS_CUTOFF / nyquist, btype='high', output='sos'
+            ).astype(np.float32)
+        self._bp_sos = self._design_bandpass(300, 3400) if 3400 < nyquist else None
+        
+        # High-pass and speech-band state carried across successive chunks
+        self._hp_zi = None
+        self._bp_zi = None
+        self.reset()
+        
+        # Zero-section filter for the fused kernel when noise reduction is off
+        self._no_sos = np.zeros((0, 6), dtype=np.float32)
+        self._no_zi = np.zeros((0, 2), dtype=np.float32)
+        
         logger.info(
             f"AudioProcessor initialized: "
             f"noise_reduction={enable_noise_reduction}, "
@@ -44,20 +84,53 @@ class AudioProcessor:
             f"preemphasis={enable_preemphasis}"
         )
     
-    def process(self, audio_data: np.ndarray) -> np.ndarray:
+    def process(self, audio_data) -> np.ndarray:
         """
         Process audio data
         
         Args:
-            audio_data: Raw audio data
+            audio_data: Raw audio data (ndarray, or PCM16 bytes-like)
             
         Returns:
             Processed audio data
         """
-        # Convert to float32
+        if isinstance(audio_data, (bytes, bytearray, memoryview)):
+            # View the PCM in place; int16 is scaled below without a copy
+            audio_data = np.frombuffer(audio_data, dtype=np.int16)
+        
+        if process_chunk is not None:
+            # Single fused kernel; int16 is scaled in registers so no
+            # intermediate float32 copy is written
+            if audio_data.dtype == np.int16:
+                audio_data = np.ascontiguousarray(audio_data.ravel())
+                scale = INV_32768
+            else:
+                audio_data = np.ascontiguousarray(audio_data.ravel(), dtype=np.float32)
+                scale = np.float32(1.0)
+            
+            use_hp = self.enable_noise_reduction and self._hp_sos is not None
+            return process_chunk(
+                audio_data,
+                scale,
+                self._hp_sos if use_hp else self._no_sos,
+                self._hp_zi if use_hp else self._no_zi,
+                self._preemphasis_coeff,
+                self._target_level,
+                self.enable_preemphasis,
+                self.enable_normalization
+            )
+        
+        # Convert to contiguous float32
         if audio_data.dtype == np.int16:
-            audio_data = audio_data.astype(np.float32) / 32768.0
+            audio_i16 = audio_data.ravel()
+            audio_data = i16_to_f32(audio_i16, np.empty(len(audio_i16), dtype=np.float32))
+        else:
+            audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
         
+        return self._process_staged(audio_data)
+    
+    def _process_staged(self, audio_data: np.ndarray) -> np.ndarray:
+        """Run the processing steps one at a time (NumPy/SciPy path)"""
         # Remove DC offset
         audio_data = self._remove_dc_offset(audio_data)
         
@@ -67,17 +140,17 @@ class AudioProcessor:
         
         # Apply pre-emphasis
         if self.enable_preemphasis:
-            audio_data = self._preemphasis(audio_data)
+            audio_data = self._preemphasis(audio_data, self._preemphasis_coeff)
         
         # Normalize
         if self.enable_normalization:
-            audio_data = self._normalize(audio_data)
+            audio_data = self._normalize(audio_data, self._target_level)
         
         return audio_data
     
     def _remove_dc_offset(self, audio_data: np.ndarray) -> np.ndarray:
         """Remove DC offset from audio"""
-        return audio_data - np.mean(audio_data)
+        return audio_data - np.mean(audio_data, dtype=np.float32)
     
     def _reduce_noise(self, audio_data: np.ndarray) -> np.ndarray:
         """
@@ -89,13 +162,13 @@ class AudioProcessor:
         Returns:
             Noise-reduced audio
         """
-        # Simple high-pass filter to remove low-frequency noise
-        nyquist = self.sample_rate / 2
-        cutoff = 80  # Hz
-        
-        if cutoff < nyquist:
-            b, a = butter(4, cutoff / nyquist, btype='high')
-            audio_data = lfilter(b, a, audio_data)
+        # Streaming high-pass filter to remove low-frequency noise
+        if self._hp_sos is not None:
+            audio_data, self._hp_zi = sosfilt(
+                self._hp_sos,
+                audio_data.astype(np.float32, copy=False),
+                zi=self._hp_zi
+            )
         
         return audio_data
     
@@ -110,7 +183,7 @@ class AudioProcessor:
         Returns:
             Pre-emphasized audio
         """
-        return np.append(audio_data[0], audio_data[1:] - coeff * audio_data[:-1])
+        return preemphasis(audio_data, coeff)
     
     def _normalize(self, audio_data: np.ndarray, target_level: float = 0.9) -> np.ndarray:
         """
@@ -123,12 +196,21 @@ class AudioProcessor:
         Returns:
             Normalized audio
         """
-        max_val = np.abs(audio_data).max()
-        
-        if max_val > 0:
-            audio_data = audio_data * (target_level / max_val)
-        
-        return audio_data
+        return peak_normalize(audio_data, target_level)
+    
+    def reset(self) -> None:
+        """Reset streaming filter state (call between independent streams)"""
+        if self._hp_sos is not None:
+            self._hp_zi = np.zeros((self._hp_sos.shape[0], 2), dtype=np.float32)
+        if self._bp_sos is not None:
+            self._bp_zi = np.zeros((self._bp_sos.shape[0], 2), dtype=np.float32)
+    
+    def _design_bandpass(self, lowcut: float, highcut: float) -> np.ndarray:
+        """Design a 4th-order Butterworth bandpass as float32 SOS"""
+        nyquist = self.sample_rate / 2
+        return butter(
+            4, [lowcut / nyquist, highcut / nyquist], btype='band', output='sos'
+        ).astype(np.float32)
     
     def estimate_noise_profile(self, audio_data: np.ndarray) -> None:
         """
@@ -150,6 +232,9 @@ class AudioProcessor:
         """
         Apply bandpass filter (useful for speech)
         
+        The default 300-3400 Hz band streams its state across calls like
+        the noise filter; other cutoffs filter each call independently.
+        
         Args:
             audio_data: Input audio
             lowcut: Low cutoff frequency in Hz
@@ -158,12 +243,15 @@ class AudioProcessor:
         Returns:
             Filtered audio
         """
-        nyquist = self.sample_rate / 2
-        low = lowcut / nyquist
-        high = highcut / nyquist
+        if (lowcut, highcut) == (300, 3400) and self._bp_sos is not None:
+            audio_data, self._bp_zi = sosfilt(
+                self._bp_sos,
+                audio_data.astype(np.float32, copy=False),
+                zi=self._bp_zi
+            )
+            return audio_data
         
-        b, a = butter(4, [low, high], btype='band')
-        return lfilter(b, a, audio_data)
+        return sosfilt(self._design_bandpass(lowcut, highcut), audio_data)
     
     def resample(self, audio_data: np.ndarray, target_rate: int) -> np.ndarray:
         """
@@ -179,11 +267,15 @@ class AudioProcessor:
         if self.sample_rate == target_rate:
             return audio_data
         
-        # Calculate resampling ratio
-        num_samples = int(len(audio_data) * target_rate / self.sample_rate)
+        # Reduce the rate ratio to integer up/down factors
+        g = gcd(self.sample_rate, target_rate)
+        up = target_rate // g
+        down = self.sample_rate // g
         
-        # Resample using scipy
-        resampled = signal.resample(audio_data, num_samples)
+        # Polyphase FIR resampling with cached filter taps
+        resampled = signal.resample_poly(
+            audio_data, up, down, window=_polyphase_filter(up, down)
+        )
         
         logger.debug(f"Resampled audio: {self.sample_rate}Hz -> {target_rate}Hz")
         
@@ -206,13 +298,9 @@ class AudioProcessor:
         Returns:
             True if audio is silence
         """
-        # Calculate RMS energy
-        rms = np.sqrt(np.mean(audio_data ** 2))
-        
-        # Check if below threshold
-        is_silent = rms < threshold
-        
-        return is_silent
+        # Compare mean square against threshold squared (no sqrt); loud
+        # input exits as soon as its energy clears the bound
+        return below_mean_square(audio_data, threshold * threshold)
     
     def calculate_energy(self, audio_data: np.ndarray) -> float:
         """
@@ -224,4 +312,4 @@ class AudioProcessor:
         Returns:
             RMS energy value
         """
-        return np.sqrt(np.mean(audio_data ** 2))
+        return rms(audio_data)
@@ -0,0 +1,214 @@
+"""
+Audio Kernels Module
+Numba-compiled sample loops for the hot audio paths
+"""
+
+import math
+import numpy as np
+from loguru import logger
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available, using NumPy audio kernels")
+
+
+# int16 full-scale reciprocal (multiply is cheaper than divide)
+INV_32768 = np.float32(1.0 / 32768.0)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def i16_to_f32(src_i16, dst_f32):
+        """Convert int16 PCM (array or memoryview) into a preallocated float32 buffer"""
+        for i in range(src_i16.shape[0]):
+            dst_f32[i] = src_i16[i] * INV_32768
+        return dst_f32
+    
+    @njit(cache=True, fastmath=True)
+    def mean_square(x):
+        """Single-pass mean of squares of a 1-D buffer (0.0 if empty)"""
+        if x.size == 0:
+            return 0.0
+        total = 0.0
+        for i in range(x.size):
+            v = float(x[i])
+            total += v * v
+        return total / x.size
+    
+    @njit(cache=True, fastmath=True)
+    def below_mean_square(x, limit):
+        """Whether mean(x**2) < limit, stopping once the running sum rules it out"""
+        n = x.size
+        if n == 0:
+            return 0.0 < limit
+        bound = limit * n
+        total = 0.0
+        # Check per block so the inner loop stays vectorizable
+        for start in range(0, n, 256):
+            for i in range(start, min(start + 256, n)):
+                v = float(x[i])
+                total += v * v
+            if total >= bound:
+                return False
+        return total < bound
+    
+    @njit(cache=True, fastmath=True)
+    def rms(x):
+        """Single-pass root mean square of a 1-D buffer"""
+        return math.sqrt(mean_square(x))
+    
+    @njit(cache=True, fastmath=True)
+    def peak_abs(x):
+        """Single-pass absolute peak of a buffer (0.0 if empty)"""
+        peak = 0.0
+        for v in x.ravel():
+            if abs(v) > peak:
+                peak = abs(v)
+        return peak
+    
+    @njit(cache=True, fastmath=True)
+    def preemphasis(x, coeff):
+        """First-order pre-emphasis filter y[n] = x[n] - coeff * x[n-1]"""
+        out = np.empty_like(x)
+        if x.size == 0:
+            return out
+        out[0] = x[0]
+        for i in range(1, x.size):
+            out[i] = x[i] - coeff * x[i - 1]
+        return out
+    
+    @njit(cache=True, fastmath=True)
+    def peak_normalize(x, target_level):
+        """Scale a buffer so its absolute peak equals target_level"""
+        peak = 0.0
+        for i in range(x.size):
+            v = abs(x[i])
+            if v > peak:
+                peak = v
+        if peak == 0.0:
+            return x.copy()
+        gain = target_level / peak
+        out = np.empty_like(x)
+        for i in range(x.size):
+            out[i] = x[i] * gain
+        return out
+    
+    @njit(cache=True, fastmath=True)
+    def process_chunk(x, scale, sos, zi, coeff, target_level, apply_preemphasis, apply_normalization):
+        """
+        Fused DC removal, SOS high-pass, pre-emphasis and peak normalization
+        
+        Two passes over the samples (mean, then filter chain) plus the
+        final gain. Input samples are multiplied by scale as they are
+        read, so int16 PCM needs no separate float32 conversion. The
+        high-pass runs as a direct-form II transposed biquad cascade
+        matching scipy.signal.sosfilt; pass zero sections to skip it. zi
+        is updated in place.
+        """
+        n = x.size
+        out = np.empty(n, dtype=np.float32)
+        if n == 0:
+            return out
+        
+        total = 0.0
+        for i in range(n):
+            total += x[i]
+        mean = total * scale / n
+        
+        prev = 0.0
+        peak = 0.0
+        for i in range(n):
+            v = x[i] * scale - mean
+            for s in range(sos.shape[0]):
+                y = sos[s, 0] * v + zi[s, 0]
+                zi[s, 0] = sos[s, 1] * v - sos[s, 4] * y + zi[s, 1]
+                zi[s, 1] = sos[s, 2] * v - sos[s, 5] * y
+                v = y
+            if apply_preemphasis:
+                y = v - coeff * prev if i > 0 else v
+                prev = v
+                v = y
+            out[i] = v
+            if abs(v) > peak:
+                peak = abs(v)
+        
+        if apply_normalization and peak > 0.0:
+            gain = target_level / peak
+            for i in range(n):
+                out[i] *= gain
+        
+        return out
+    
+    @njit(cache=True, fastmath=True)
+    def f32_to_i16(src_f32, dst_i16):
+        """Convert float PCM into a preallocated int16 buffer with saturation"""
+        for i in range(src_f32.shape[0]):
+            v = src_f32[i] * 32768.0
+            if v > 32767.0:
+                v = 32767.0
+            elif v < -32768.0:
+                v = -32768.0
+            dst_i16[i] = np.int16(v)
+        return dst_i16
+
+else:
+    
+    # No fused NumPy equivalent; AudioProcessor runs its staged path
+    process_chunk = None
+    
+    def i16_to_f32(src_i16, dst_f32):
+        """Convert int16 PCM (array or memoryview) into a preallocated float32 buffer"""
+        np.multiply(src_i16, INV_32768, out=dst_f32, casting="unsafe")
+        return dst_f32
+    
+    def mean_square(x):
+        """Single-pass mean of squares of a 1-D buffer (0.0 if empty)"""
+        if x.size == 0:
+            return 0.0
+        # Float buffers go straight to BLAS dot; integer PCM would overflow
+        if x.dtype.kind != 'f':
+            x = x.astype(np.float64)
+        return float(np.dot(x, x)) / x.size
+    
+    def below_mean_square(x, limit):
+        """Whether mean(x**2) < limit"""
+        # One BLAS pass beats an early-exit loop in Python
+        return mean_square(x) < limit
+    
+    def rms(x):
+        """Single-pass root mean square of a 1-D buffer"""
+        return math.sqrt(mean_square(x))
+    
+    def peak_abs(x):
+        """Single-pass absolute peak of a buffer (0.0 if empty)"""
+        if x.size == 0:
+            return 0.0
+        return float(max(x.max(), -x.min()))
+    
+    def preemphasis(x, coeff):
+        """First-order pre-emphasis filter y[n] = x[n] - coeff * x[n-1]"""
+        out = np.empty_like(x)
+        if x.size == 0:
+            return out
+        out[0] = x[0]
+        # Two in-place passes, no temporaries
+        np.multiply(x[:-1], coeff, out=out[1:])
+        np.subtract(x[1:], out[1:], out=out[1:])
+        return out
+    
+    def peak_normalize(x, target_level):
+        """Scale a buffer so its absolute peak equals target_level"""
+        # max/min reductions need no |x| temporary
+        peak = peak_abs(x)
+        if peak == 0.0:
+            return x.copy()
+        return np.multiply(x, target_level / peak, dtype=x.dtype)
+    
+    def f32_to_i16(src_f32, dst_i16):
+        """Convert float PCM into a preallocated int16 buffer with saturation"""
+        dst_i16[:] = np.clip(src_f32 * 32768.0, -32768.0, 32767.0)
+        return dst_i16
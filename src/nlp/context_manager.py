@@ -3,14 +3,19 @@ Context Manager Module
 Manages conversation state and history
 """
 
+import heapq
+import sys
+import threading
 import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Deque, List, Dict, Any, Optional, Tuple
 from collections import deque
+from collections.abc import Mapping
+from itertools import islice
 from loguru import logger
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTurn:
     """Single conversation turn"""
     timestamp: float
@@ -20,28 +25,67 @@ class ConversationTurn:
     entities: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationContext:
     """Complete conversation context"""
     session_id: str
     user_id: Optional[str] = None
     language: str = "en"
     scenario: Optional[str] = None
-    turns: List[ConversationTurn] = field(default_factory=list)
+    turns: Deque[ConversationTurn] = field(default_factory=deque)
+    turns_by_speaker: Dict[str, Deque[ConversationTurn]] = field(default_factory=dict)
     user_profile: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
     start_time: float = field(default_factory=time.time)
     last_activity: float = field(default_factory=time.time)
+    last_activity_mono: float = field(default_factory=time.monotonic)  # for expiry
+
+
+class _ContextSummary(Mapping):
+    """Read-only summary view of a context; values are read on access"""
+    
+    __slots__ = ("_context",)
+    
+    _KEYS = (
+        "session_id", "language", "scenario", "turn_count",
+        "duration", "last_activity", "user_profile"
+    )
+    
+    def __init__(self, context: ConversationContext):
+        self._context = context
+    
+    def __getitem__(self, key: str) -> Any:
+        context = self._context
+        if key == "turn_count":
+            return len(context.turns)
+        if key == "duration":
+            return time.time() - context.start_time
+        if key in self._KEYS:
+            return getattr(context, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
 
 
 class ContextManager:
     """Manages conversation context and history"""
     
+    # Lock stripes for the context table (power of two)
+    NUM_SHARDS = 16
+    
     def __init__(
         self,
         max_history: int = 10,
         context_timeout: int = 300,  # 5 minutes
-        enable_persistence: bool = False
+        enable_persistence: bool = False,
+        max_sessions: int = 1000
     ):
         """
         Initialize context manager
@@ -50,22 +94,49 @@ class ContextManager:
             max_history: Maximum number of turns to keep
             context_timeout: Context timeout in seconds
             enable_persistence: Enable context persistence
+            max_sessions: Maximum number of live contexts; creating one
+                more evicts the least recently active
         """
         self.max_history = max_history
         self.context_timeout = context_timeout
         self.enable_persistence = enable_persistence
+        self.max_sessions = max(1, max_sessions)
         
-        # Active contexts
-        self.contexts: Dict[str, ConversationContext] = {}
+        # Active contexts, striped across shards so concurrent sessions
+        # only contend when they hash to the same shard
+        self._shards: List[Dict[str, ConversationContext]] = [
+            {} for _ in range(self.NUM_SHARDS)
+        ]
+        self._locks = [threading.Lock() for _ in range(self.NUM_SHARDS)]
         
-        # Current context
+        # Current context (shared: the pipeline sets it on one thread and
+        # adds turns from its NLP/response threads)
         self.current_context: Optional[ConversationContext] = None
         
+        # Min-heap of (expires_at, session_id), one entry per activity;
+        # entries superseded by newer activity are discarded when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_lock = threading.Lock()
+        self._next_sweep = float("inf")
+        
         logger.info(
             f"ContextManager initialized: max_history={max_history}, "
-            f"timeout={context_timeout}s"
+            f"timeout={context_timeout}s, max_sessions={self.max_sessions}"
         )
     
+    def _shard_index(self, session_id: str) -> int:
+        """Shard holding a session's context"""
+        return hash(session_id) & (self.NUM_SHARDS - 1)
+    
+    @property
+    def contexts(self) -> Dict[str, ConversationContext]:
+        """Snapshot of all active contexts by session ID"""
+        snapshot = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                snapshot.update(shard)
+        return snapshot
+    
     def create_context(
         self,
         session_id: str,
@@ -86,11 +157,19 @@ class ContextManager:
         context = ConversationContext(
             session_id=session_id,
             user_id=user_id,
-            language=language
+            language=language,
+            turns=deque(maxlen=self.max_history)
         )
         
-        self.contexts[session_id] = context
+        index = self._shard_index(session_id)
+        with self._locks[index]:
+            self._shards[index][session_id] = context
         self.current_context = context
+        self._schedule_expiry(context)
+        
+        while sum(map(len, self._shards)) > self.max_sessions:
+            if self._evict_least_recent() is None:
+                break
         
         logger.info(f"Created context: session={session_id}, language={language}")
         
@@ -106,16 +185,26 @@ class ContextManager:
         Returns:
             ConversationContext or None
         """
-        context = self.contexts.get(session_id)
-        
-        if context:
-            # Check if context is expired
-            if time.time() - context.last_activity > self.context_timeout:
-                logger.warning(f"Context expired: {session_id}")
-                self.delete_context(session_id)
-                return None
-        
-        return context
+        return self._lookup(session_id, time.monotonic())
+    
+    def _lookup(self, session_id: str, now: float) -> Optional[ConversationContext]:
+        """Look up a context, reusing the caller's monotonic timestamp"""
+        # Expired contexts are removed by the sweep, which only runs once
+        # the earliest pending expiry has passed
+        if now >= self._next_sweep:
+            self._sweep_expired(now)
+        
+        return self._shards[self._shard_index(session_id)].get(session_id)
+    
+    def _resolve(
+        self,
+        session_id: Optional[str],
+        now: Optional[float] = None
+    ) -> Optional[ConversationContext]:
+        """Context for session_id, or the current context if none given"""
+        if not session_id:
+            return self.current_context
+        return self._lookup(session_id, time.monotonic() if now is None else now)
     
     def set_current_context(self, session_id: str) -> bool:
         """
@@ -151,34 +240,91 @@ class ContextManager:
             entities: Optional extracted entities
             session_id: Optional session ID (uses current if not provided)
         """
-        # Get context
-        if session_id:
-            context = self.get_context(session_id)
-        else:
-            context = self.current_context
+        # One monotonic read serves both the expiry check and the update
+        now_mono = time.monotonic()
+        context = self._resolve(session_id, now_mono)
         
         if not context:
             logger.warning("No active context for adding turn")
             return
         
+        # One wall-clock read per turn (display), monotonic for expiry
+        now = time.time()
+        
+        # Share one string object per speaker across turns and the
+        # per-speaker index (speaker names may arrive deserialized)
+        speaker = sys.intern(speaker)
+        
         # Create turn
         turn = ConversationTurn(
-            timestamp=time.time(),
+            timestamp=now,
             speaker=speaker,
             text=text,
             intent=intent,
             entities=entities or {}
         )
         
-        # Add to context
-        context.turns.append(turn)
-        context.last_activity = time.time()
+        self._store_turns(context, (turn,), now, now_mono)
+        
+        # Brace-style args: loguru formats (and truncates) only if DEBUG is enabled
+        logger.debug("Added turn: {}: {:.50}...", speaker, text)
+    
+    def add_turns(
+        self,
+        turns: List[Dict[str, Any]],
+        session_id: Optional[str] = None
+    ) -> None:
+        """
+        Add several conversation turns under one lock and expiry update
+        
+        Args:
+            turns: Turns as dicts with "speaker" and "text", and optionally
+                "intent", "entities" and "timestamp" (time.time())
+            session_id: Optional session ID (uses current if not provided)
+        """
+        now_mono = time.monotonic()
+        context = self._resolve(session_id, now_mono)
         
-        # Trim history if needed
-        if len(context.turns) > self.max_history:
-            context.turns = context.turns[-self.max_history:]
+        if not context:
+            logger.warning("No active context for adding turns")
+            return
         
-        logger.debug(f"Added turn: {speaker}: {text[:50]}...")
+        now = time.time()
+        
+        batch = tuple(
+            ConversationTurn(
+                timestamp=turn.get("timestamp", now),
+                speaker=sys.intern(turn["speaker"]),
+                text=turn["text"],
+                intent=turn.get("intent"),
+                entities=turn.get("entities") or {}
+            )
+            for turn in turns
+        )
+        
+        self._store_turns(context, batch, now, now_mono)
+        
+        logger.debug("Added {} turns", len(batch))
+    
+    def _store_turns(
+        self,
+        context: ConversationContext,
+        turns: tuple,
+        now: float,
+        now_mono: float
+    ) -> None:
+        """Append turns to a context and record the activity"""
+        # Bounded deques evict the oldest turn
+        with self._locks[self._shard_index(context.session_id)]:
+            context.turns.extend(turns)
+            for turn in turns:
+                speaker_turns = context.turns_by_speaker.get(turn.speaker)
+                if speaker_turns is None:
+                    speaker_turns = context.turns_by_speaker[turn.speaker] = deque(maxlen=self.max_history)
+                speaker_turns.append(turn)
+            context.last_activity = now
+            context.last_activity_mono = now_mono
+        self._schedule_expiry(context)
     
     def get_last_turn(
         self,
@@ -195,17 +341,15 @@ class ContextManager:
         Returns:
             Last ConversationTurn or None
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if not context or not context.turns:
             return None
         
-        # Find last turn by speaker
+        # Each speaker's turns are kept separately by add_turn
         if speaker:
-            for turn in reversed(context.turns):
-                if turn.speaker == speaker:
-                    return turn
-            return None
+            speaker_turns = context.turns_by_speaker.get(speaker)
+            return speaker_turns[-1] if speaker_turns else None
         
         return context.turns[-1]
     
@@ -226,27 +370,25 @@ class ContextManager:
         Returns:
             List of ConversationTurn objects
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if not context:
             return []
         
-        turns = context.turns
-        
-        # Filter by speaker
-        if speaker:
-            turns = [t for t in turns if t.speaker == speaker]
+        # Filter by speaker (last max_history turns of that speaker)
+        turns = context.turns_by_speaker.get(speaker, ()) if speaker else context.turns
         
-        # Limit results
+        # Limit results, copying only the requested tail
         if limit:
-            turns = turns[-limit:]
+            start = max(0, len(turns) - limit)
+            return list(islice(turns, start, None))
         
-        return turns
+        return list(turns)
     
     def get_context_summary(
         self,
         session_id: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> Mapping:
         """
         Get context summary
         
@@ -254,22 +396,14 @@ class ContextManager:
             session_id: Optional session ID
             
         Returns:
-            Context summary dictionary
+            Read-only context summary mapping (values read on access)
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if not context:
             return {}
         
-        return {
-            "session_id": context.session_id,
-            "language": context.language,
-            "scenario": context.scenario,
-            "turn_count": len(context.turns),
-            "duration": time.time() - context.start_time,
-            "last_activity": context.last_activity,
-            "user_profile": context.user_profile
-        }
+        return _ContextSummary(context)
     
     def set_scenario(
         self,
@@ -283,7 +417,7 @@ class ContextManager:
             scenario: Scenario name
             session_id: Optional session ID
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if context:
             context.scenario = scenario
@@ -301,7 +435,7 @@ class ContextManager:
             language: Language code
             session_id: Optional session ID
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if context:
             context.language = language
@@ -319,11 +453,11 @@ class ContextManager:
             profile_data: Profile data to update
             session_id: Optional session ID
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if context:
             context.user_profile.update(profile_data)
-            logger.debug(f"Updated user profile: {list(profile_data.keys())}")
+            logger.opt(lazy=True).debug("Updated user profile: {}", lambda: list(profile_data.keys()))
     
     def set_metadata(
         self,
@@ -339,7 +473,7 @@ class ContextManager:
             value: Metadata value
             session_id: Optional session ID
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if context:
             context.metadata[key] = value
@@ -361,7 +495,7 @@ class ContextManager:
         Returns:
             Metadata value
         """
-        context = self.get_context(session_id) if session_id else self.current_context
+        context = self._resolve(session_id)
         
         if context:
             return context.metadata.get(key, default)
@@ -375,9 +509,11 @@ class ContextManager:
         Args:
             session_id: Session identifier
         """
-        if session_id in self.contexts:
-            del self.contexts[session_id]
-            
+        index = self._shard_index(session_id)
+        with self._locks[index]:
+            removed = self._shards[index].pop(session_id, None)
+        
+        if removed is not None:
             if self.current_context and self.current_context.session_id == session_id:
                 self.current_context = None
             
@@ -385,28 +521,106 @@ class ContextManager:
     
     def clear_all_contexts(self) -> None:
         """Clear all contexts"""
-        self.contexts.clear()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
         self.current_context = None
+        with self._expiry_lock:
+            self._expiry_heap.clear()
+            self._next_sweep = float("inf")
         logger.info("Cleared all contexts")
     
-    def cleanup_expired_contexts(self) -> int:
+    def _schedule_expiry(self, context: ConversationContext) -> None:
+        """Record when a context expires given its latest activity"""
+        expires_at = context.last_activity_mono + self.context_timeout
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (expires_at, context.session_id))
+            self._next_sweep = min(self._next_sweep, expires_at)
+    
+    def _sweep_expired(self, now: float) -> int:
         """
-        Clean up expired contexts
+        Delete contexts whose expiry has passed
         
+        Args:
+            now: Current time.monotonic() reading
+            
         Returns:
             Number of contexts deleted
         """
-        current_time = time.time()
-        expired = []
+        heap = self._expiry_heap
+        due = []
+        
+        with self._expiry_lock:
+            while heap and heap[0][0] < now:
+                due.append(heapq.heappop(heap)[1])
+            self._next_sweep = heap[0][0] if heap else float("inf")
+        
+        expired = 0
+        
+        for session_id in due:
+            index = self._shard_index(session_id)
+            with self._locks[index]:
+                context = self._shards[index].get(session_id)
+                
+                # Stale entry: context deleted or active again since
+                if not context or context.last_activity_mono + self.context_timeout >= now:
+                    continue
+                
+                del self._shards[index][session_id]
+            
+            if self.current_context is context:
+                self.current_context = None
+            
+            logger.warning(f"Context expired: {session_id}")
+            expired += 1
         
-        for session_id, context in self.contexts.items():
-            if current_time - context.last_activity > self.context_timeout:
-                expired.append(session_id)
+        return expired
+    
+    def _evict_least_recent(self) -> Optional[str]:
+        """
+        Delete the least recently active context
+        
+        The expiry heap is ordered by last activity, so its earliest
+        live entry is the LRU context.
         
-        for session_id in expired:
-            self.delete_context(session_id)
+        Returns:
+            Session ID of the evicted context, or None if there is none
+        """
+        heap = self._expiry_heap
+        
+        while True:
+            with self._expiry_lock:
+                if not heap:
+                    return None
+                expires_at, session_id = heapq.heappop(heap)
+                self._next_sweep = heap[0][0] if heap else float("inf")
+            
+            index = self._shard_index(session_id)
+            with self._locks[index]:
+                context = self._shards[index].get(session_id)
+                
+                # Stale entry: context deleted or active again since
+                if not context or context.last_activity_mono + self.context_timeout != expires_at:
+                    continue
+                
+                del self._shards[index][session_id]
+            
+            if self.current_context is context:
+                self.current_context = None
+            
+            logger.info(f"Evicted least recently active context: {session_id}")
+            return session_id
+    
+    def cleanup_expired_contexts(self) -> int:
+        """
+        Clean up expired contexts
+        
+        Returns:
+            Number of contexts deleted
+        """
+        expired = self._sweep_expired(time.monotonic())
         
         if expired:
-            logger.info(f"Cleaned up {len(expired)} expired contexts")
+            logger.info(f"Cleaned up {expired} expired contexts")
         
-        return len(expired)
+        return expired
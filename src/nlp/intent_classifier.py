@@ -4,13 +4,103 @@ Fast intent recognition and entity extraction
 """
 
 import re
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from loguru import logger
 import time
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    logger.warning("hyperscan not available, using prefiltered regex intent matching")
 
-@dataclass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logger.warning("pyahocorasick not available, using substring entity matching")
+
+
+# Entity keyword tables (first listed entry wins)
+_SCENARIO_KEYWORDS = {
+    "restaurant": ("restaurant", "ordering food", "cafeteria", "menu"),
+    "job_interview": ("job interview", "interview", "hiring"),
+    "shopping": ("shopping", "store", "buying", "purchase"),
+    "travel": ("travel", "airport", "hotel", "vacation")
+}
+
+_LANGUAGES = (
+    "spanish", "french", "german", "italian", "portuguese",
+    "chinese", "japanese", "korean"
+)
+
+_NUMBER_RE = re.compile(r'\d+')
+_QUOTED_RE = re.compile(r'"([^"]*)"')
+
+# Intent pattern prefilter: words (with inner apostrophes), simple
+# \b(...|...)\b alternations, and plain leading words
+_WORD_RE = re.compile(r"\w+(?:'\w+)*")
+_ALTERNATION_RE = re.compile(r"\\b\(([^()\[\]\\]*)\)\\b")
+_LITERAL_RE = re.compile(r"[\w']+")
+
+
+def _build_keyword_automaton():
+    """Build one Aho-Corasick automaton over every entity keyword"""
+    automaton = ahocorasick.Automaton()
+    
+    for priority, (scenario, keywords) in enumerate(_SCENARIO_KEYWORDS.items()):
+        for keyword in keywords:
+            automaton.add_word(keyword, ("scenario", priority, scenario))
+    for priority, lang in enumerate(_LANGUAGES):
+        automaton.add_word(lang, ("language", priority, lang))
+    
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+def _find_keywords(text_lower: str, want_scenario: bool = True) -> Dict[str, str]:
+    """
+    Find the highest-priority scenario and language keyword in text
+    
+    Args:
+        text_lower: Lowercased input text
+        want_scenario: Also look for scenario keywords
+        
+    Returns:
+        Mapping of entity kind ("scenario", "language") to value
+    """
+    if _KEYWORD_AUTOMATON is not None:
+        # Single linear scan; keep the earliest-listed hit per kind
+        best = {}
+        for _, (kind, priority, value) in _KEYWORD_AUTOMATON.iter(text_lower):
+            if kind not in best or priority < best[kind][0]:
+                best[kind] = (priority, value)
+        return {kind: value for kind, (_, value) in best.items()}
+    
+    # Plain substring checks: for tables this small they beat a combined
+    # regex, which has to try every alternative at every position
+    found = {}
+    if want_scenario:
+        for scenario, keywords in _SCENARIO_KEYWORDS.items():
+            if any(keyword in text_lower for keyword in keywords):
+                found["scenario"] = scenario
+                break
+    for lang in _LANGUAGES:
+        if lang in text_lower:
+            found["language"] = lang
+            break
+    return found
+
+
+@dataclass(slots=True)
 class Intent:
     """Classified intent with entities"""
     name: str
@@ -26,7 +116,8 @@ class IntentClassifier:
     def __init__(
         self,
         model_name: str = "rule-based",
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        cache_size: int = 4096
     ):
         """
         Initialize intent classifier
@@ -34,12 +125,32 @@ class IntentClassifier:
         Args:
             model_name: Model type (rule-based, ml)
             confidence_threshold: Minimum confidence threshold
+            cache_size: Number of recent texts whose results are kept
+                (0 disables the cache)
         """
         self.model_name = model_name
         self.confidence_threshold = confidence_threshold
+        self.cache_size = cache_size
         
-        # Define intents and patterns
-        self.intents = self._load_intents()
+        # text -> (intent name, confidence, entities); LRU order
+        self._cache: OrderedDict[str, tuple] = OrderedDict()
+        
+        # Define intents and patterns (names interned so every Intent
+        # returned by classify shares the same name objects)
+        self.intents = {sys.intern(name): data for name, data in self._load_intents().items()}
+        
+        # Precompiled per-pattern regexes of every classifiable intent
+        # (index = Hyperscan pattern id); "unknown" is the fallback only
+        self._patterns = tuple(
+            (re.compile(pattern, re.IGNORECASE), intent_name, priority)
+            for priority, (intent_name, intent_data) in enumerate(self.intents.items())
+            if intent_name != "unknown"
+            for pattern in intent_data["patterns"]
+        )
+        
+        # First-word literal -> pattern ids, to skip patterns that can't match
+        self._literal_index, self._unindexed = self._index_literals(self._patterns)
+        self._hs_db = self._compile_hyperscan() if HYPERSCAN_AVAILABLE else None
         
         logger.info(
             f"IntentClassifier initialized: model={model_name}, "
@@ -180,42 +291,152 @@ class IntentClassifier:
             }
         }
     
-    def classify(self, text: str) -> Intent:
+    @staticmethod
+    def _index_literals(patterns: list) -> tuple:
         """
-        Classify intent from text
+        Index patterns by the first word of each of their alternatives
+        
+        A pattern of the form \\b(word ...|word ...)\\b can only match if
+        one of those first words appears as a word in the text. Patterns
+        of any other shape are left unindexed and always run.
         
         Args:
-            text: Input text
+            patterns: (compiled regex, intent, priority) tuples
             
         Returns:
-            Intent object
+            Tuple of (literal -> pattern ids, unindexed pattern ids)
         """
-        start_time = time.time()
+        literal_index: Dict[str, List[int]] = {}
+        unindexed = []
+        
+        for pattern_id, (pattern, _, _) in enumerate(patterns):
+            body = _ALTERNATION_RE.fullmatch(pattern.pattern)
+            words = [alt.split()[0].lower() for alt in body.group(1).split("|")] if body else []
+            
+            if not words or not all(_LITERAL_RE.fullmatch(w) for w in words):
+                unindexed.append(pattern_id)
+                continue
+            
+            for word in set(words):
+                literal_index.setdefault(word, []).append(pattern_id)
         
-        text_lower = text.lower()
+        return literal_index, tuple(unindexed)
+    
+    def _compile_hyperscan(self):
+        """
+        Compile all patterns into one Hyperscan database
+        
+        Returns:
+            Hyperscan database, or None if a pattern is unsupported
+        """
+        flags = (
+            hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 |
+            hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+        )
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[p.pattern.encode("utf-8") for p, _, _ in self._patterns],
+                ids=list(range(len(self._patterns))),
+                flags=[flags] * len(self._patterns)
+            )
+        except hyperscan.error as e:
+            logger.warning(f"Hyperscan compile failed, using prefiltered regex: {e}")
+            return None
+        
+        return db
+    
+    @staticmethod
+    def _on_hyperscan_match(pattern_id, start, end, flags, matched) -> None:
+        """Hyperscan match callback: collect matching pattern ids"""
+        matched.append(pattern_id)
+    
+    def _iter_matches(self, text_lower: str):
+        """
+        Find the first occurrence of every matching pattern
+        
+        Args:
+            text_lower: Lowercased input text
+            
+        Yields:
+            Tuples of (intent name, intent priority, match length)
+        """
+        if self._hs_db is not None:
+            # One DFA scan finds which patterns match; only those are
+            # re-run to get re-compatible character spans
+            matched = []
+            self._hs_db.scan(
+                text_lower.encode("utf-8"),
+                match_event_handler=self._on_hyperscan_match,
+                context=matched
+            )
+        else:
+            # Only run patterns whose leading literal occurs as a word
+            candidates = set(self._unindexed)
+            literal_index = self._literal_index
+            for word in _WORD_RE.findall(text_lower):
+                word = word.lower()
+                # \b also matches inside contractions ("hi's"), so try the parts
+                tokens = (word, *word.split("'")) if "'" in word else (word,)
+                for token in tokens:
+                    candidates.update(literal_index.get(token, ()))
+            matched = sorted(candidates)
+        
+        for pattern_id in matched:
+            pattern, intent_name, priority = self._patterns[pattern_id]
+            match = pattern.search(text_lower)
+            if match:
+                yield intent_name, priority, match.end() - match.start()
+    
+    def _best_intent(self, text: str) -> tuple:
+        """
+        Pick the highest-confidence intent for a text
         
-        # Try to match patterns
+        Args:
+            text: Input text
+            
+        Returns:
+            Tuple of (intent name, confidence)
+        """
+        # Patterns are case-insensitive, so ASCII text (the common case)
+        # needs no lowercased copy; other scripts keep the original lower()
+        text_lower = text if text.isascii() else text.lower()
+        text_len = max(len(text), 1)
+        
+        # Single pass over all patterns; ties go to the earlier intent
         best_intent = "unknown"
         best_confidence = 0.0
+        best_priority = len(self.intents)
         
-        for intent_name, intent_data in self.intents.items():
-            if intent_name == "unknown":
-                continue
+        for intent_name, priority, span in self._iter_matches(text_lower):
+            # Calculate confidence based on match length
+            confidence = min(0.9, span / text_len + 0.5)
             
-            for pattern in intent_data["patterns"]:
-                match = re.search(pattern, text_lower, re.IGNORECASE)
-                if match:
-                    # Calculate confidence based on match length
-                    confidence = min(0.9, len(match.group(0)) / len(text) + 0.5)
-                    
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_intent = intent_name
+            if confidence > best_confidence or (
+                confidence == best_confidence and priority < best_priority
+            ):
+                best_confidence = confidence
+                best_intent = intent_name
+                best_priority = priority
         
-        # Extract entities
-        entities = self._extract_entities(text, best_intent)
+        return best_intent, best_confidence
+    
+    def classify(self, text: str) -> Intent:
+        """
+        Classify intent from text
         
-        processing_time = time.time() - start_time
+        Args:
+            text: Input text
+            
+        Returns:
+            Intent object
+        """
+        start_time = time.perf_counter_ns()
+        
+        best_intent, best_confidence, entities = self._classify_text(text)
+        
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
         
         result = Intent(
             name=best_intent,
@@ -226,12 +447,82 @@ class IntentClassifier:
         )
         
         logger.debug(
-            f"Intent: {best_intent} (confidence={best_confidence:.2f}, "
-            f"time={processing_time:.3f}s)"
+            "Intent: {} (confidence={:.2f}, time={:.3f}s)",
+            best_intent, best_confidence, processing_time
         )
         
         return result
     
+    def classify_batch(self, texts: List[str]) -> List[Intent]:
+        """
+        Classify a batch of texts in one call
+        
+        Timing and logging happen once per batch; each Intent reports
+        the batch's mean per-text processing time.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Intent objects, in input order
+        """
+        if not texts:
+            return []
+        
+        start_time = time.perf_counter_ns()
+        
+        classify_text = self._classify_text
+        results = []
+        for text in texts:
+            name, confidence, entities = classify_text(text)
+            results.append(Intent(
+                name=name,
+                confidence=confidence,
+                entities=entities,
+                raw_text=text
+            ))
+        
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9 / len(texts)
+        for result in results:
+            result.processing_time = processing_time
+        
+        logger.debug(
+            "Classified batch of {} (time={:.3f}s per text)",
+            len(texts), processing_time
+        )
+        
+        return results
+    
+    def _classify_text(self, text: str) -> tuple:
+        """
+        Classify a text, reusing the result for recently seen texts
+        
+        Keyed on the exact text: confidence depends on its length and
+        quoted entities keep their casing.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Tuple of (intent name, confidence, entities)
+        """
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            name, confidence, entities = cached
+            # Callers may mutate the entities they get back
+            return name, confidence, dict(entities)
+        
+        name, confidence = self._best_intent(text)
+        entities = self._extract_entities(text, name)
+        
+        if self.cache_size > 0:
+            if len(self._cache) >= self.cache_size:
+                self._cache.popitem(last=False)
+            self._cache[text] = (name, confidence, dict(entities))
+        
+        return name, confidence, entities
+    
     def _extract_entities(self, text: str, intent: str) -> Dict[str, Any]:
         """
         Extract entities from text based on intent
@@ -244,40 +535,28 @@ class IntentClassifier:
             Dictionary of entities
         """
         entities = {}
+        want_scenario = intent == "request_scenario"
+        keywords = _find_keywords(text.lower(), want_scenario)
         
         # Extract scenario entity
-        if intent == "request_scenario":
-            scenarios = {
-                "restaurant": ["restaurant", "ordering food", "cafeteria", "menu"],
-                "job_interview": ["job interview", "interview", "hiring"],
-                "shopping": ["shopping", "store", "buying", "purchase"],
-                "travel": ["travel", "airport", "hotel", "vacation"]
-            }
-            
-            text_lower = text.lower()
-            for scenario, keywords in scenarios.items():
-                if any(keyword in text_lower for keyword in keywords):
-                    entities["scenario"] = scenario
-                    break
+        if want_scenario and "scenario" in keywords:
+            entities["scenario"] = keywords["scenario"]
         
         # Extract language entity
-        languages = ["spanish", "french", "german", "italian", "portuguese", 
-                    "chinese", "japanese", "korean"]
-        text_lower = text.lower()
-        for lang in languages:
-            if lang in text_lower:
-                entities["language"] = lang
-                break
+        if "language" in keywords:
+            entities["language"] = keywords["language"]
         
         # Extract numbers
-        numbers = re.findall(r'\d+', text)
+        numbers = _NUMBER_RE.findall(text)
         if numbers:
             entities["numbers"] = [int(n) for n in numbers]
         
-        # Extract quoted text (for translations)
-        quoted = re.findall(r'"([^"]*)"', text)
-        if quoted:
-            entities["quoted_text"] = quoted
+        # Extract quoted text (for translations); most utterances have no
+        # quotes, and a substring test is far cheaper than the regex scan
+        if '"' in text:
+            quoted = _QUOTED_RE.findall(text)
+            if quoted:
+                entities["quoted_text"] = quoted
         
         return entities
     
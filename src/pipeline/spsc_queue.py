@@ -0,0 +1,168 @@
+"""
+SPSC Queue Module
+Lock-free single-producer/single-consumer handoff between pipeline stages
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Optional
+
+
+class SPSCQueue:
+    """
+    Bounded single-producer/single-consumer ring
+    
+    put() only advances _head and get() only advances _tail, so neither
+    side takes a lock on the fast path. A consumer that finds the ring
+    empty parks on a bare lock used as a wakeup signal, which the
+    producer releases only when a consumer is waiting. Raises
+    queue.Empty and queue.Full like queue.Queue so stage loops keep
+    their shape.
+    """
+    
+    # Producer poll interval while the ring is full (seconds)
+    POLL_INTERVAL = 0.001
+    
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize queue
+        
+        Args:
+            capacity: Number of slots (rounded up to a power of two)
+        """
+        size = 1
+        while size < capacity:
+            size <<= 1
+        
+        self._slots = [None] * size
+        self._mask = size - 1
+        self._head = 0
+        self._tail = 0
+        
+        # Items before this index were discarded by clear(); the consumer
+        # frees their slots when it next reads
+        self._discard_before = 0
+        
+        # Held while nobody has signalled; put() releases it to wake a
+        # parked consumer (cheaper than an Event's condition variable)
+        self._waiting = False
+        self._wakeup = threading.Lock()
+        self._wakeup.acquire()
+    
+    def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        """
+        Append an item (producer side), waiting while the ring is full
+        
+        Slots are only reused once the consumer has moved past them, so a
+        stopped consumer leaves the ring full; pass a timeout when the
+        consumer may not be running.
+        
+        Args:
+            item: Item to enqueue
+            timeout: Maximum time to wait for a free slot (None waits forever)
+        
+        Raises:
+            queue.Full: If no slot frees up within timeout
+        """
+        head = self._head
+        if head - self._tail > self._mask:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while head - self._tail > self._mask:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise queue.Full
+                time.sleep(self.POLL_INTERVAL)
+        
+        self._slots[head & self._mask] = item
+        self._head = head + 1
+        
+        if self._waiting:
+            self._waiting = False
+            try:
+                self._wakeup.release()
+            except RuntimeError:
+                pass  # already signalled
+    
+    def get_nowait(self) -> Any:
+        """
+        Remove and return the oldest item (consumer side)
+        
+        Returns:
+            Oldest queued item
+        
+        Raises:
+            queue.Empty: If no item is queued
+        """
+        tail = self._tail
+        discard_before = self._discard_before
+        if tail < discard_before:
+            # Drop references to discarded items; the producer can't be
+            # refilling these slots until _tail moves past them
+            for index in range(tail, discard_before):
+                self._slots[index & self._mask] = None
+            tail = discard_before
+        
+        if tail == self._head:
+            self._tail = tail
+            raise queue.Empty
+        
+        index = tail & self._mask
+        item = self._slots[index]
+        self._slots[index] = None
+        self._tail = tail + 1
+        return item
+    
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Remove and return the oldest item, blocking while empty
+        
+        Args:
+            timeout: Maximum time to wait (None waits forever)
+        
+        Returns:
+            Oldest queued item
+        
+        Raises:
+            queue.Empty: If nothing arrives within timeout
+        """
+        try:
+            return self.get_nowait()
+        except queue.Empty:
+            pass
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            # Announce the wait, then re-check: either this sees the
+            # producer's item or the producer sees _waiting and wakes us
+            # (a stale wakeup only costs one extra loop)
+            self._waiting = True
+            try:
+                item = self.get_nowait()
+                self._waiting = False
+                return item
+            except queue.Empty:
+                pass
+            
+            if deadline is None:
+                self._wakeup.acquire()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._wakeup.acquire(timeout=remaining):
+                    self._waiting = False
+                    try:
+                        return self.get_nowait()
+                    except queue.Empty:
+                        raise queue.Empty from None
+    
+    def clear(self) -> None:
+        """Discard queued items (safe to call from any thread)"""
+        self._discard_before = self._head
+    
+    def qsize(self) -> int:
+        """Approximate number of queued items"""
+        return max(0, self._head - max(self._tail, self._discard_before))
+    
+    def empty(self) -> bool:
+        """Whether the queue is (approximately) empty"""
+        return self.qsize() == 0
@@ -4,37 +4,70 @@ Orchestrates all components for zero-latency voice interaction
 """
 
 import asyncio
+import os
 import threading
 import queue
 import time
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, Callable, Dict, Any
 from loguru import logger
 
 from ..audio import AudioInput, AudioOutput, AudioProcessor
+from ..audio.kernels import i16_to_f32
 from ..vad import VADDetector
 from ..stt import STTEngine, TranscriptionResult
 from ..nlp import IntentClassifier, ContextManager, Intent
 from ..response import ResponseGenerator, Response
 from ..tts import TTSEngine
+from .spsc_queue import SPSCQueue
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PipelineConfig:
-    """Pipeline configuration"""
+    """Pipeline configuration (immutable, shareable across sessions)"""
     sample_rate: int = 16000
     chunk_size: int = 1024
     enable_vad: bool = True
+    vad_backend: str = "webrtc"
+    vad_model_path: Optional[str] = None
     enable_streaming: bool = True
+    tts_compute_type: str = "float32"  # Coqui precision (float32, int8)
     max_latency_ms: int = 200
     enable_interruption: bool = True
     enable_monitoring: bool = True
+    nlp_batch_window_ms: int = 50
+    max_utterance_s: int = 30
+    audio_thread_cpu: Optional[int] = None  # pin audio/VAD thread (Linux)
+
+
+@dataclass(slots=True)
+class TranscriptItem:
+    """Transcribed utterance handed from the audio stage to NLP"""
+    text: str
+    confidence: float
+    start_time: int  # time.perf_counter_ns()
+
+
+@dataclass(slots=True)
+class IntentItem:
+    """Classified turn handed from the NLP stage to response generation"""
+    intent: Intent
+    start_time: int  # time.perf_counter_ns()
+    user_turn: Dict[str, Any]  # recorded together with the reply
 
 
 class VoicePipeline:
     """Real-time voice processing pipeline"""
     
+    # Latency samples kept per metric (averages cover this window)
+    METRICS_WINDOW = 1024
+    
+    # Seconds a stage waits on a full handoff queue before dropping the item
+    HANDOFF_TIMEOUT = 1.0
+    
     def __init__(self, config: Optional[PipelineConfig] = None):
         """
         Initialize voice pipeline
@@ -59,31 +92,60 @@ class VoicePipeline:
         self.is_running = False
         self.is_speaking = False
         self.session_id = f"session_{int(time.time())}"
+        self.language = "en"
         
-        # Queues for async processing
-        self.audio_queue = queue.Queue()
-        self.text_queue = queue.Queue()
-        self.response_queue = queue.Queue()
+        # Stage handoffs: each has exactly one producer and one consumer
+        # thread, so lock-free rings replace mutex/condvar queues
+        self.text_queue = SPSCQueue()
+        self.response_queue = SPSCQueue()
         
         # Threads
         self.processing_threads = []
         
+        # Voiced audio awaiting transcription, appended in place into one
+        # preallocated buffer (an utterance is transcribed from a view)
+        self._utterance_buffer = np.empty(
+            self.config.sample_rate * self.config.max_utterance_s,
+            dtype=np.float32
+        )
+        self._utterance_len = 0
+        self._audio_lock = threading.Lock()
+        
+        # Unprocessed copy of the same utterance for on_utterance listeners
+        # (acoustic models expect raw PCM, not pre-emphasized audio), and
+        # (processed, raw) pairs of the chunks the VAD may still return;
+        # only filled while a listener is set
+        self._raw_utterance_buffer = np.empty_like(self._utterance_buffer)
+        self._raw_frames: deque = deque()  # bounded once the VAD exists
+        self._raw_complete = True  # raw buffer covers the whole utterance
+        
+        # Utterances are transcribed off the audio path so VAD keeps up
+        # while STT (which releases the GIL) runs; one worker keeps order
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="STT")
+        
+        # Bumped on session reset; transcripts of older sessions are dropped
+        self._session_epoch = 0
+        
+        # Set when the user barges in during a reply
+        self._interrupt_event = threading.Event()
+        
         # Callbacks
         self.on_transcription: Optional[Callable[[str], None]] = None
+        self.on_utterance: Optional[Callable[[str, np.ndarray], None]] = None
         self.on_intent: Optional[Callable[[Intent], None]] = None
         self.on_response: Optional[Callable[[Response], None]] = None
         self.on_speaking_start: Optional[Callable] = None
         self.on_speaking_end: Optional[Callable] = None
         
-        # Metrics
-        self.metrics = {
-            "total_latency_ms": [],
-            "stt_latency_ms": [],
-            "nlp_latency_ms": [],
-            "response_latency_ms": [],
-            "tts_latency_ms": [],
-            "utterances_processed": 0
-        }
+        # Metrics: bounded latency windows with running sums, so memory
+        # stays flat and averages are O(1)
+        latency_keys = (
+            "total_latency_ms", "stt_latency_ms", "nlp_latency_ms",
+            "response_latency_ms", "tts_latency_ms"
+        )
+        self.metrics = {key: deque(maxlen=self.METRICS_WINDOW) for key in latency_keys}
+        self.metrics["utterances_processed"] = 0
+        self._metric_sums = dict.fromkeys(latency_keys, 0.0)
         
         logger.info("VoicePipeline initialized")
     
@@ -103,41 +165,55 @@ class VoicePipeline:
         """
         logger.info("Initializing pipeline components...")
         
-        # Audio components
+        self.language = language
+        
+        # VAD
+        if self.config.enable_vad:
+            self.vad = VADDetector(
+                sample_rate=self.config.sample_rate,
+                aggressiveness=3,
+                backend=self.config.vad_backend,
+                model_path=self.config.vad_model_path
+            )
+            self.vad.register_callbacks(
+                on_speech_start=self._on_speech_start,
+                on_speech_end=self._on_speech_end
+            )
+            # Covers every chunk still held in the VAD's ring buffer
+            self._raw_frames = deque(maxlen=self.vad.num_padding_frames)
+        
+        # Audio components; with VAD enabled, capture only queues audio
+        # around speech, keeping enough trailing silence for the detector
+        # to close the utterance
         self.audio_input = AudioInput(
             sample_rate=self.config.sample_rate,
-            chunk_size=self.config.chunk_size
+            chunk_size=self.config.chunk_size,
+            vad_gate=self.vad is not None,
+            post_roll_chunks=self.vad.num_padding_frames if self.vad else 0
         )
         
+        # Reply chunks are synthesized while earlier ones play; the bound
+        # keeps TTS at most two chunks ahead, so a barge-in wastes little
         self.audio_output = AudioOutput(
             sample_rate=22050,
-            buffer_size=2048
+            buffer_size=2048,
+            max_queued_buffers=2
         )
         
         self.audio_processor = AudioProcessor(
             sample_rate=self.config.sample_rate
         )
         
-        # VAD
-        if self.config.enable_vad:
-            self.vad = VADDetector(
-                sample_rate=self.config.sample_rate,
-                aggressiveness=3
-            )
-            self.vad.register_callbacks(
-                on_speech_start=self._on_speech_start,
-                on_speech_end=self._on_speech_end
-            )
-        
         # STT
         self.stt = STTEngine(
             model_name=stt_model,
             language=language,
             enable_streaming=self.config.enable_streaming
         )
+        # Final results are forwarded by _process_utterance once it has
+        # checked they still belong to the current session
         self.stt.register_callbacks(
-            on_partial_result=self._on_partial_transcription,
-            on_final_result=self._on_final_transcription
+            on_partial_result=self._on_partial_transcription
         )
         
         # NLP
@@ -154,7 +230,8 @@ class VoicePipeline:
         # TTS
         self.tts = TTSEngine(
             engine=tts_engine,
-            enable_streaming=True
+            enable_streaming=True,
+            compute_type=self.config.tts_compute_type
         )
         self.tts.register_callbacks(
             on_synthesis_start=self._on_tts_start,
@@ -175,6 +252,10 @@ class VoicePipeline:
         if not self.audio_input:
             self.initialize_components()
         
+        # Fresh filter state for the new capture stream
+        if self.audio_processor:
+            self.audio_processor.reset()
+        
         # Start audio I/O
         self.audio_input.start()
         self.audio_output.start()
@@ -234,46 +315,100 @@ class VoicePipeline:
         
         logger.info("Voice pipeline stopped")
     
+    def reset_session(self, session_id: Optional[str] = None) -> None:
+        """
+        Clear per-session state so warm components can serve a new session
+        
+        Args:
+            session_id: New session identifier
+        """
+        with self._audio_lock:
+            self._utterance_len = 0
+            self._raw_frames.clear()
+            self._raw_complete = True
+            self._session_epoch += 1
+            if self.audio_processor:
+                self.audio_processor.reset()
+            if self.vad:
+                self.vad.reset()
+        
+        # Wait out the STT job in flight (queued ones now skip as stale)
+        # so no worker touches the pipeline after it changes hands
+        self._stt_executor.submit(lambda: None).result()
+        
+        if self.stt:
+            self.stt.reset()
+        
+        # Drop work queued for the previous session
+        for pending in (self.text_queue, self.response_queue):
+            pending.clear()
+        
+        self.is_speaking = False
+        
+        # Callbacks belong to the previous session's transport
+        self.on_transcription = None
+        self.on_utterance = None
+        self.on_intent = None
+        self.on_response = None
+        self.on_speaking_start = None
+        self.on_speaking_end = None
+        
+        for key in self._metric_sums:
+            self.metrics[key].clear()
+            self._metric_sums[key] = 0.0
+        self.metrics["utterances_processed"] = 0
+        
+        # Fresh conversation context
+        if self.context_manager:
+            self.context_manager.delete_context(self.session_id)
+        
+        self.session_id = session_id or f"session_{int(time.time())}"
+        
+        if self.context_manager:
+            self.context_manager.create_context(
+                session_id=self.session_id,
+                language=self.language
+            )
+        
+        logger.debug(f"Pipeline reset for session {self.session_id}")
+    
+    @staticmethod
+    def _pin_current_thread(cpu: int) -> None:
+        """Pin the calling thread to one CPU to keep the VAD tick jitter-free"""
+        if not hasattr(os, "sched_setaffinity"):
+            logger.warning("Thread CPU pinning is not supported on this platform")
+            return
+        
+        try:
+            # pid 0 is the calling thread on Linux
+            os.sched_setaffinity(0, {cpu})
+            logger.info(f"{threading.current_thread().name} thread pinned to CPU {cpu}")
+        except OSError as e:
+            logger.warning(f"Could not pin thread to CPU {cpu}: {e}")
+    
     def _audio_processing_loop(self) -> None:
         """Main audio processing loop"""
         logger.debug("Audio processing loop started")
         
-        audio_buffer = []
+        if self.config.audio_thread_cpu is not None:
+            self._pin_current_thread(self.config.audio_thread_cpu)
+        
+        # Chunks are processed before the next read, so one scratch
+        # buffer is reused instead of allocating per chunk
+        capture_buffer = np.empty(
+            (self.audio_input.chunk_size, self.audio_input.channels),
+            dtype=np.int16
+        )
         
         while self.is_running:
             try:
                 # Read audio chunk
-                audio_chunk = self.audio_input.read(timeout=0.1)
+                audio_chunk = self.audio_input.read(timeout=0.1, out=capture_buffer)
                 
                 if audio_chunk is None:
                     continue
                 
-                # Process audio
-                processed_audio = self.audio_processor.process(audio_chunk.flatten())
-                
-                # VAD processing
-                if self.vad:
-                    is_speaking, voiced_frames = self.vad.process_frame(processed_audio)
-                    
-                    if voiced_frames:
-                        # Add voiced frames to buffer
-                        audio_buffer.extend(voiced_frames)
-                    
-                    # Check for speech end
-                    if not is_speaking and audio_buffer:
-                        # Process complete utterance
-                        complete_audio = np.concatenate(audio_buffer)
-                        self._process_utterance(complete_audio)
-                        audio_buffer.clear()
-                else:
-                    # Without VAD, process chunks directly
-                    audio_buffer.append(processed_audio)
-                    
-                    # Process every second
-                    if len(audio_buffer) >= int(self.config.sample_rate / self.config.chunk_size):
-                        complete_audio = np.concatenate(audio_buffer)
-                        self._process_utterance(complete_audio)
-                        audio_buffer.clear()
+                self.process_audio_chunk(audio_chunk)
                         
             except Exception as e:
                 logger.error(f"Error in audio processing: {e}")
@@ -281,26 +416,170 @@ class VoicePipeline:
         
         logger.debug("Audio processing loop stopped")
     
-    def _process_utterance(self, audio_data: np.ndarray) -> None:
-        """Process complete utterance"""
-        start_time = time.time()
+    def process_audio_chunk(self, audio_chunk: np.ndarray) -> None:
+        """
+        Process a chunk of input audio
+        
+        Used by the capture loop and by external audio sources
+        (WebSocket, WebRTC) that feed the pipeline directly.
+        
+        No-copy contract: audio_chunk may be a view of a reused capture
+        buffer. It is flattened as a view, read by AudioProcessor (and,
+        while on_utterance is set, by the float32 conversion of the raw
+        copy), and never modified or retained; VAD and the utterance
+        buffers only keep new arrays. Raw copies are paired with the
+        frames VAD returns by object identity, which holds because VAD
+        hands back the very arrays it was given.
+        
+        Args:
+            audio_chunk: Audio samples (int16 or float32)
+        """
+        with self._audio_lock:
+            audio_chunk = audio_chunk.ravel()
+            
+            # Raw audio is only kept while someone listens for it
+            raw_audio = self._raw_copy(audio_chunk) if self.on_utterance else None
+            
+            # Process audio
+            processed_audio = self.audio_processor.process(audio_chunk)
+            
+            # VAD processing
+            if self.vad:
+                if raw_audio is not None:
+                    self._raw_frames.append((processed_audio, raw_audio))
+                is_speaking, voiced_frames = self.vad.process_frame(processed_audio)
+                
+                if voiced_frames:
+                    raw_frames = None
+                    if raw_audio is not None:
+                        # Frames that predate the listener have no raw copy
+                        raw_by_id = {id(p): r for p, r in self._raw_frames}
+                        if all(id(frame) in raw_by_id for frame in voiced_frames):
+                            raw_frames = [raw_by_id[id(frame)] for frame in voiced_frames]
+                    
+                    # Add voiced frames to buffer
+                    self._append_utterance_audio(voiced_frames, raw_frames)
+                
+                # Check for speech end
+                if not is_speaking:
+                    # Process complete utterance
+                    self._flush_utterance()
+            else:
+                # Without VAD, process chunks directly
+                self._append_utterance_audio(
+                    (processed_audio,), None if raw_audio is None else (raw_audio,)
+                )
+                
+                # Process every second
+                if self._utterance_len >= self.config.sample_rate:
+                    self._flush_utterance()
+    
+    @staticmethod
+    def _raw_copy(audio_chunk: np.ndarray) -> np.ndarray:
+        """Float32 copy of an unprocessed chunk (the input may be reused)"""
+        if audio_chunk.dtype == np.int16:
+            return i16_to_f32(audio_chunk, np.empty(audio_chunk.shape[0], dtype=np.float32))
+        return audio_chunk.astype(np.float32)
+    
+    def _append_utterance_audio(self, frames, raw_frames=None) -> None:
+        """Copy frames (and their raw copies, if given) into the utterance buffers"""
+        buffer = self._utterance_buffer
+        raw_buffer = self._raw_utterance_buffer
+        capacity = buffer.shape[0]
+        start = self._utterance_len
+        end = start + sum(frame.shape[0] for frame in frames)
+        
+        # Common case: one C-level gather straight into each buffer
+        if end <= capacity:
+            np.concatenate(frames, out=buffer[start:end])
+            if raw_frames is None:
+                self._raw_complete = False
+            else:
+                np.concatenate(raw_frames, out=raw_buffer[start:end])
+            self._utterance_len = end
+            return
+        
+        for i, frame in enumerate(frames):
+            n = min(frame.shape[0], capacity)
+            if self._utterance_len + n > capacity:
+                # Overlong utterance: transcribe what fits and start over
+                self._flush_utterance()
+            start = self._utterance_len
+            buffer[start:start + n] = frame[:n]
+            if raw_frames is None:
+                self._raw_complete = False
+            else:
+                raw_buffer[start:start + n] = raw_frames[i][:n]
+            self._utterance_len += n
+    
+    def _flush_utterance(self) -> None:
+        """Transcribe buffered audio, if any, and empty the buffer"""
+        if not self._utterance_len:
+            return
+        
+        # The buffers are refilled while STT runs, so the job gets copies
+        audio_data = self._utterance_buffer[:self._utterance_len].copy()
+        raw_audio = None
+        if self.on_utterance and self._raw_complete:
+            raw_audio = self._raw_utterance_buffer[:self._utterance_len].copy()
+        self._utterance_len = 0
+        self._raw_complete = True
         
+        self._stt_executor.submit(
+            self._process_utterance, audio_data, raw_audio, time.perf_counter_ns(), self._session_epoch
+        )
+    
+    def _process_utterance(
+        self,
+        audio_data: np.ndarray,
+        raw_audio: Optional[np.ndarray],
+        start_time: int,
+        epoch: int
+    ) -> None:
+        """
+        Transcribe a complete utterance and queue it for NLP
+        
+        Args:
+            audio_data: Utterance audio
+            raw_audio: Same utterance before processing (None when
+                nobody listens for on_utterance)
+            start_time: time.perf_counter_ns() when the utterance ended
+            epoch: Session epoch the utterance belongs to
+        """
         try:
+            if epoch != self._session_epoch:
+                return
+            
             # Speech-to-text
-            stt_start = time.time()
+            stt_start = time.perf_counter_ns()
             transcription = self.stt.transcribe(audio_data, is_final=True)
-            stt_time = (time.time() - stt_start) * 1000
+            stt_time = (time.perf_counter_ns() - stt_start) / 1e6
+            
+            if epoch != self._session_epoch:
+                return
+            
+            self._on_final_transcription(transcription)
             
             if transcription.text.strip():
-                # Add to processing queue
-                self.text_queue.put({
-                    "text": transcription.text,
-                    "confidence": transcription.confidence,
-                    "start_time": start_time
-                })
+                # Add to processing queue (nothing drains it while stopped)
+                if self.is_running:
+                    try:
+                        self.text_queue.put(TranscriptItem(
+                            text=transcription.text,
+                            confidence=transcription.confidence,
+                            start_time=start_time
+                        ), timeout=self.HANDOFF_TIMEOUT)
+                    except queue.Full:
+                        logger.warning("NLP stage backed up, dropping transcript")
+                else:
+                    logger.debug("Pipeline stopped, transcript not queued for NLP")
+                
+                # Hand the unprocessed utterance to listeners that analyse it
+                if self.on_utterance and raw_audio is not None:
+                    self.on_utterance(transcription.text, raw_audio)
                 
                 # Metrics
-                self.metrics["stt_latency_ms"].append(stt_time)
+                self._record_metric("stt_latency_ms", stt_time)
                 
                 logger.info(f"Transcribed: '{transcription.text}' (STT: {stt_time:.0f}ms)")
                 
@@ -316,30 +595,29 @@ class VoicePipeline:
                 # Get text from queue
                 item = self.text_queue.get(timeout=0.1)
                 
-                text = item["text"]
-                start_time = item["start_time"]
+                text, start_time = self._collect_transcripts(item)
                 
                 # Intent classification
-                nlp_start = time.time()
+                nlp_start = time.perf_counter_ns()
                 intent = self.intent_classifier.classify(text)
-                nlp_time = (time.time() - nlp_start) * 1000
-                
-                # Update context
-                self.context_manager.add_turn(
-                    speaker="user",
-                    text=text,
-                    intent=intent.name,
-                    entities=intent.entities
-                )
+                nlp_time = (time.perf_counter_ns() - nlp_start) / 1e6
                 
-                # Add to response queue
-                self.response_queue.put({
-                    "intent": intent,
-                    "start_time": start_time
-                })
+                # Add to response queue; the user turn is stored in the
+                # context alongside the assistant reply
+                self.response_queue.put(IntentItem(
+                    intent=intent,
+                    start_time=start_time,
+                    user_turn={
+                        "speaker": "user",
+                        "text": text,
+                        "intent": intent.name,
+                        "entities": intent.entities,
+                        "timestamp": time.time()
+                    }
+                ), timeout=self.HANDOFF_TIMEOUT)
                 
                 # Metrics
-                self.metrics["nlp_latency_ms"].append(nlp_time)
+                self._record_metric("nlp_latency_ms", nlp_time)
                 
                 # Callback
                 if self.on_intent:
@@ -349,11 +627,44 @@ class VoicePipeline:
                 
             except queue.Empty:
                 continue
+            except queue.Full:
+                logger.warning("Response stage backed up, dropping turn")
             except Exception as e:
                 logger.error(f"Error in NLP processing: {e}")
         
         logger.debug("NLP processing loop stopped")
     
+    def _collect_transcripts(self, first: TranscriptItem) -> tuple:
+        """
+        Merge transcripts queued within the batch window into one turn
+        
+        Back-to-back utterances (or a backlog behind slow STT) then cost
+        one intent classification and one reply instead of one each.
+        
+        Args:
+            first: First queued transcription item
+            
+        Returns:
+            Tuple of (merged text, earliest start time)
+        """
+        texts = [first.text]
+        start_time = first.start_time
+        deadline = time.monotonic() + self.config.nlp_batch_window_ms / 1000
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self.text_queue.get(timeout=remaining)
+                else:
+                    item = self.text_queue.get_nowait()
+            except queue.Empty:
+                break
+            texts.append(item.text)
+            start_time = min(start_time, item.start_time)
+        
+        return " ".join(t.strip() for t in texts), start_time
+    
     def _response_processing_loop(self) -> None:
         """Response generation and TTS loop"""
         logger.debug("Response processing loop started")
@@ -363,40 +674,55 @@ class VoicePipeline:
                 # Get intent from queue
                 item = self.response_queue.get(timeout=0.1)
                 
-                intent = item["intent"]
-                start_time = item["start_time"]
+                intent = item.intent
+                start_time = item.start_time
                 
                 # Generate response
-                response_start = time.time()
+                response_start = time.perf_counter_ns()
                 response = self.response_generator.generate(
                     intent=intent.name,
                     context={"mode": "general"},
                     entities=intent.entities
                 )
-                response_time = (time.time() - response_start) * 1000
+                response_time = (time.perf_counter_ns() - response_start) / 1e6
                 
-                # Update context
-                self.context_manager.add_turn(
-                    speaker="assistant",
-                    text=response.text
-                )
+                # Update context (user turn and reply in one locked append)
+                self.context_manager.add_turns([
+                    item.user_turn,
+                    {"speaker": "assistant", "text": response.text}
+                ])
                 
-                # Synthesize speech
-                tts_start = time.time()
-                audio_data = self.tts.synthesize(response.text)
-                tts_time = (time.time() - tts_start) * 1000
+                # Synthesize chunk by chunk; each chunk plays while the
+                # next one is synthesized
+                self._interrupt_event.clear()
+                tts_start = time.perf_counter_ns()
+                tts_time = None
+                total_latency = None
                 
-                # Play audio
-                if len(audio_data) > 0:
-                    self.audio_output.play(audio_data)
+                for sentence in self.tts.split_sentences(response.text):
+                    if self._interrupt_event.is_set():
+                        break
+                    
+                    # Engines that stream (XTTS) hand over audio mid-sentence
+                    for audio_data in self.tts.stream_sentence(sentence):
+                        if self._interrupt_event.is_set():
+                            break
+                        
+                        self.audio_output.play(audio_data)
+                        
+                        # Latency to first audio
+                        if tts_time is None:
+                            tts_time = (time.perf_counter_ns() - tts_start) / 1e6
+                            total_latency = (time.perf_counter_ns() - start_time) / 1e6
                 
-                # Calculate total latency
-                total_latency = (time.time() - start_time) * 1000
+                if tts_time is None:
+                    tts_time = (time.perf_counter_ns() - tts_start) / 1e6
+                    total_latency = (time.perf_counter_ns() - start_time) / 1e6
                 
                 # Metrics
-                self.metrics["response_latency_ms"].append(response_time)
-                self.metrics["tts_latency_ms"].append(tts_time)
-                self.metrics["total_latency_ms"].append(total_latency)
+                self._record_metric("response_latency_ms", response_time)
+                self._record_metric("tts_latency_ms", tts_time)
+                self._record_metric("total_latency_ms", total_latency)
                 self.metrics["utterances_processed"] += 1
                 
                 # Callback
@@ -453,6 +779,9 @@ class VoicePipeline:
         """Interrupt assistant speech"""
         logger.info("Interrupting assistant")
         
+        # Skip the remaining chunks of the current reply
+        self._interrupt_event.set()
+        
         # Stop TTS
         if self.tts:
             self.tts.stop()
@@ -463,18 +792,27 @@ class VoicePipeline:
         
         self.is_speaking = False
     
+    def _record_metric(self, key: str, value: float) -> None:
+        """Append a latency sample, keeping the window's running sum"""
+        window = self.metrics[key]
+        if len(window) == window.maxlen:
+            self._metric_sums[key] -= window[0]
+        window.append(value)
+        self._metric_sums[key] += value
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get pipeline metrics"""
-        def avg(values):
-            return sum(values) / len(values) if values else 0
+        def avg(key):
+            count = len(self.metrics[key])
+            return self._metric_sums[key] / count if count else 0
         
         return {
             "utterances_processed": self.metrics["utterances_processed"],
-            "avg_total_latency_ms": avg(self.metrics["total_latency_ms"]),
-            "avg_stt_latency_ms": avg(self.metrics["stt_latency_ms"]),
-            "avg_nlp_latency_ms": avg(self.metrics["nlp_latency_ms"]),
-            "avg_response_latency_ms": avg(self.metrics["response_latency_ms"]),
-            "avg_tts_latency_ms": avg(self.metrics["tts_latency_ms"]),
+            "avg_total_latency_ms": avg("total_latency_ms"),
+            "avg_stt_latency_ms": avg("stt_latency_ms"),
+            "avg_nlp_latency_ms": avg("nlp_latency_ms"),
+            "avg_response_latency_ms": avg("response_latency_ms"),
+            "avg_tts_latency_ms": avg("tts_latency_ms"),
             "is_running": self.is_running,
             "is_speaking": self.is_speaking
         }
@@ -3,16 +3,52 @@ Response Generation Module
 Fast response generation with template and dynamic modes
 """
 
+import functools
 import json
 import random
+import re
+import sys
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, Hashable, List, Optional, Any
 from pathlib import Path
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available, using stdlib json for templates")
 
-@dataclass
+
+# Template placeholders: {entity_name}
+_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_template(template: str) -> tuple:
+    """Split a template into alternating literal and placeholder-name parts"""
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+# Intent prefixes stripped before mapping to a general template key
+# (each at most once, in this order)
+_INTENT_PREFIX_RE = re.compile(r"(?:request_)?(?:ask_)?(?:command_)?(?:question_)?(?:express_)?")
+
+_INTENT_TEMPLATE_MAP = {
+    "practice": "request_practice",
+    "correction": "ask_correction",
+    "repeat": "request_repeat",
+    "translation": "request_translation",
+    "understanding": "acknowledgment",
+    "confusion": "clarification",
+    "help": "acknowledgment"
+}
+
+
+@dataclass(slots=True)
 class Response:
     """Generated response"""
     text: str
@@ -46,11 +82,15 @@ class ResponseGenerator:
         self.enable_cache = enable_cache
         self.cache_size = cache_size
         
-        # Load templates
-        self.templates = self._load_templates(template_file)
+        # Templates are loaded (and indexed) on first use
+        self._template_file = template_file
         
-        # Response cache
-        self.cache: Dict[str, Response] = {}
+        # Response cache (LRU: hits move to the end, evict from the front)
+        self.cache: OrderedDict[Hashable, Response] = OrderedDict()
+        
+        # Per-instance PRNG for template choice (not shared with other
+        # users of the module-level generator)
+        self._rng = random.Random()
         
         # Statistics
         self.stats = {
@@ -62,6 +102,21 @@ class ResponseGenerator:
         
         logger.info(f"ResponseGenerator initialized: mode={mode}, cache={enable_cache}")
     
+    @functools.cached_property
+    def templates(self) -> Dict[str, Any]:
+        """Response templates, loaded from the template file on first access"""
+        return self._load_templates(self._template_file)
+    
+    @functools.cached_property
+    def _intent_index(self) -> Dict[tuple, List[str]]:
+        """(mode, intent) -> templates lookup, built on first use"""
+        return self._build_intent_index()
+    
+    @functools.cached_property
+    def _template_intents(self) -> frozenset:
+        """Intents that have templates, built on first use"""
+        return frozenset(intent for _, intent in self._intent_index)
+    
     def _load_templates(self, template_file: Optional[str]) -> Dict[str, Any]:
         """Load response templates from file"""
         if not template_file:
@@ -71,8 +126,11 @@ class ResponseGenerator:
         
         if template_path.exists():
             try:
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    templates = json.load(f)
+                if ORJSON_AVAILABLE:
+                    templates = orjson.loads(template_path.read_bytes())
+                else:
+                    with open(template_path, 'r', encoding='utf-8') as f:
+                        templates = json.load(f)
                 logger.info(f"Loaded templates from {template_file}")
                 return templates
             except Exception as e:
@@ -126,15 +184,16 @@ class ResponseGenerator:
         Returns:
             Response object
         """
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Check cache
         if self.enable_cache:
             cache_key = self._get_cache_key(intent, context, entities)
-            if cache_key in self.cache:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                self.cache.move_to_end(cache_key)
                 self.stats["cache_hits"] += 1
-                cached_response = self.cache[cache_key]
-                logger.debug(f"Cache hit for intent: {intent}")
+                logger.debug("Cache hit for intent: {}", intent)
                 return cached_response
         
         # Generate response based on mode
@@ -147,7 +206,7 @@ class ResponseGenerator:
             source = "dynamic"
             self.stats["dynamic_used"] += 1
         
-        generation_time = time.time() - start_time
+        generation_time = (time.perf_counter_ns() - start_time) / 1e9
         
         # Create response object
         response = Response(
@@ -165,8 +224,8 @@ class ResponseGenerator:
         # Cache response
         if self.enable_cache:
             if len(self.cache) >= self.cache_size:
-                # Remove oldest entry (simple FIFO)
-                self.cache.pop(next(iter(self.cache)))
+                # Remove least recently used entry
+                self.cache.popitem(last=False)
             self.cache[cache_key] = response
         
         self.stats["total_generated"] += 1
@@ -180,18 +239,30 @@ class ResponseGenerator:
     
     def _has_template(self, intent: str) -> bool:
         """Check if template exists for intent"""
-        # Check in language learning templates
-        if "language_learning" in self.templates:
-            for category, intents in self.templates["language_learning"].items():
-                if intent in intents:
-                    return True
-        
-        # Check in general templates
-        if "general" in self.templates:
-            if intent in self.templates["general"]:
-                return True
-        
-        return False
+        return intent in self._template_intents
+    
+    def _build_intent_index(self) -> Dict[tuple, List[str]]:
+        """
+        Flatten the template tables into direct lookups
+        
+        (mode, intent) keys map to template lists: language-learning
+        intents to the first category listing them, general keys to
+        themselves. Rebuilt whenever templates are added.
+        
+        Returns:
+            Template lists by (mode, intent)
+        """
+        index = {}
+        
+        for intents in self.templates.get("language_learning", {}).values():
+            if isinstance(intents, dict):
+                for intent, templates in intents.items():
+                    index.setdefault(("language-learning", intent), templates)
+        
+        for key, templates in self.templates.get("general", {}).items():
+            index[("general", key)] = templates
+        
+        return index
     
     def _generate_from_template(
         self,
@@ -200,29 +271,20 @@ class ResponseGenerator:
         entities: Optional[Dict[str, Any]]
     ) -> str:
         """Generate response from template"""
-        templates = []
-        
-        # Get template category based on intent
-        if context and context.get("mode") == "language-learning":
-            # Look in language learning templates
-            if "language_learning" in self.templates:
-                for category, intents in self.templates["language_learning"].items():
-                    if intent in intents:
-                        templates = intents[intent]
-                        break
-        
-        # Fall back to general templates
-        if not templates and "general" in self.templates:
-            # Map intent to template key
-            template_key = self._map_intent_to_template(intent)
-            templates = self.templates["general"].get(template_key, [])
-        
-        # Default templates
-        if not templates:
-            templates = self.templates["general"].get("acknowledgment", ["I understand."])
+        index = self._intent_index
+        mode = context.get("mode", "general") if context else "general"
+        
+        # Mode-specific templates, then general templates for the mapped
+        # intent, then the default acknowledgment
+        templates = (
+            (mode == "language-learning" and index.get((mode, intent)))
+            or index.get(("general", self._map_intent_to_template(intent)))
+            or index.get(("general", "acknowledgment"))
+            or ["I understand."]
+        )
         
         # Select random template
-        response_text = random.choice(templates)
+        response_text = self._rng.choice(templates)
         
         # Fill in entities if any
         if entities:
@@ -251,51 +313,48 @@ class ResponseGenerator:
         else:
             return "I understand. Please continue."
     
-    def _map_intent_to_template(self, intent: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _map_intent_to_template(intent: str) -> str:
         """Map intent name to template key"""
-        # Remove prefixes
-        for prefix in ["request_", "ask_", "command_", "question_", "express_"]:
-            if intent.startswith(prefix):
-                intent = intent[len(prefix):]
-        
-        # Map specific intents
-        intent_map = {
-            "practice": "request_practice",
-            "correction": "ask_correction",
-            "repeat": "request_repeat",
-            "translation": "request_translation",
-            "understanding": "acknowledgment",
-            "confusion": "clarification",
-            "help": "acknowledgment"
-        }
-        
-        return intent_map.get(intent, "acknowledgment")
+        bare = intent[_INTENT_PREFIX_RE.match(intent).end():]
+        return _INTENT_TEMPLATE_MAP.get(bare, "acknowledgment")
     
     def _fill_template(self, template: str, entities: Dict[str, Any]) -> str:
         """Fill template with entity values"""
-        for key, value in entities.items():
-            placeholder = "{" + key + "}"
-            if placeholder in template:
-                template = template.replace(placeholder, str(value))
-        
-        return template
+        # Most templates have no placeholders at all
+        if "{" not in template:
+            return template
+        
+        # Templates are parsed once; odd parts are placeholder names and
+        # unknown placeholders are kept as-is
+        parts = _split_template(template)
+        return "".join(
+            part if i % 2 == 0
+            else str(entities[part]) if part in entities
+            else "{" + part + "}"
+            for i, part in enumerate(parts)
+        )
     
     def _get_cache_key(
         self,
         intent: str,
         context: Optional[Dict[str, Any]],
         entities: Optional[Dict[str, Any]]
-    ) -> str:
+    ) -> Hashable:
         """Generate cache key"""
-        # Simple key based on intent and entities
-        key_parts = [intent]
+        # Most turns carry no entities; the intent alone is the key
+        if not entities:
+            return intent
         
-        if entities:
-            # Sort entities for consistent key
-            for k, v in sorted(entities.items()):
-                key_parts.append(f"{k}:{v}")
-        
-        return "|".join(key_parts)
+        return (intent, self._normalize_entities(entities))
+    
+    @staticmethod
+    def _normalize_entities(entities: Dict[str, Any]) -> tuple:
+        """Canonical entity form, so case/spacing variants share a cache entry"""
+        return tuple(sorted(
+            (str(k).lower(), str(v).strip().lower()) for k, v in entities.items()
+        ))
     
     def add_template(
         self,
@@ -311,10 +370,15 @@ class ResponseGenerator:
             intent: Intent name
             templates: List of template strings
         """
-        if category not in self.templates:
-            self.templates[category] = {}
-        
-        self.templates[category][intent] = templates
+        # Classifier intent names are interned; match them so cache keys
+        # and index lookups compare by identity
+        category = sys.intern(category)
+        intent = sys.intern(intent)
+        self.templates.setdefault(category, {})[intent] = templates
+        
+        # Rebuild the lookup tables on next use
+        self.__dict__.pop("_intent_index", None)
+        self.__dict__.pop("_template_intents", None)
         logger.info(f"Added template: {category}.{intent}")
     
     def clear_cache(self) -> None:
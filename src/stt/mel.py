@@ -0,0 +1,126 @@
+"""
+Mel Feature Module
+Batched log-mel spectrogram for faster-whisper
+"""
+
+import numpy as np
+from scipy import fft as sp_fft
+from loguru import logger
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+
+# log10 of the 1e-10 floor: every frame inside the zero padding lands here
+_SILENT_LOG_MEL = np.float32(-10.0)
+
+
+class MelFeatureExtractor:
+    """
+    Drop-in replacement for faster-whisper's FeatureExtractor
+    
+    The stock extractor runs one FFT per frame in a Python loop, including
+    the frames covering the 30 s of zero padding it appends. Here all
+    frames that touch audio go through one batched STFT (torch on CUDA,
+    scipy otherwise) and padding frames are filled with their known
+    value. Output matches Whisper's torch.stft-based features.
+    """
+    
+    def __init__(self, base, device: str = "cpu"):
+        """
+        Initialize extractor
+        
+        Args:
+            base: faster-whisper FeatureExtractor to take parameters from
+            device: Device to run the STFT on (cpu, cuda)
+        """
+        self.base = base
+        self.n_fft = base.n_fft
+        self.hop_length = base.hop_length
+        self.mel_filters = base.mel_filters.astype(np.float32)
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype(np.float32)
+        
+        self.use_torch = TORCH_AVAILABLE and device == "cuda" and torch.cuda.is_available()
+        if self.use_torch:
+            self._torch_filters = torch.from_numpy(self.mel_filters).cuda()
+            self._torch_window = torch.from_numpy(self.window).cuda()
+        
+        logger.debug(f"MelFeatureExtractor on {'cuda' if self.use_torch else 'cpu'}")
+    
+    def __getattr__(self, name):
+        # n_samples, nb_max_frames, time_per_frame, ... live on the base
+        return getattr(self.base, name)
+    
+    def __call__(self, waveform: np.ndarray, padding: bool = True, chunk_length=None) -> np.ndarray:
+        """
+        Compute the normalized log-mel spectrogram
+        
+        Args:
+            waveform: Audio samples (float32)
+            padding: Append chunk-length zero padding (as faster-whisper does);
+                without it, input shorter than one hop yields no frames
+            chunk_length: Override the chunk length in seconds
+        
+        Returns:
+            (n_mels, frames) float32 log-mel features
+        """
+        if chunk_length is not None:
+            self.base.n_samples = chunk_length * self.base.sampling_rate
+            self.base.nb_max_frames = self.base.n_samples // self.hop_length
+        
+        hop = self.hop_length
+        half = self.n_fft // 2
+        num_samples = waveform.shape[0]
+        total = num_samples + (self.base.n_samples if padding else 0)
+        
+        # Centered frames, minus the trailing one Whisper drops
+        num_frames = total // hop
+        if num_frames == 0:
+            return np.zeros((self.mel_filters.shape[0], 0), dtype=np.float32)
+        
+        if not padding:
+            # Every frame touches audio; reflect both ends like torch.stft
+            signal = np.pad(waveform.astype(np.float32, copy=False), half, mode="reflect")
+            log_spec = self._log_mel(signal, num_frames)
+        else:
+            # Frames whose window still overlaps real audio
+            num_active = min(num_frames, (num_samples + half + hop - 1) // hop)
+            
+            log_spec = np.full((self.mel_filters.shape[0], num_frames), _SILENT_LOG_MEL, dtype=np.float32)
+            
+            # Reflect-pad the front, zero-pad the back (the tail is padding)
+            signal = np.zeros((num_active - 1) * hop + self.n_fft, dtype=np.float32)
+            reflect = min(half, num_samples - 1)
+            signal[half - reflect:half] = waveform[reflect:0:-1]
+            signal[half:half + num_samples] = waveform[:signal.shape[0] - half]
+            
+            log_spec[:, :num_active] = self._log_mel(signal, num_active)
+        
+        np.maximum(log_spec, log_spec.max() - 8.0, out=log_spec)
+        log_spec += 4.0
+        log_spec /= 4.0
+        return log_spec
+    
+    def _log_mel(self, signal: np.ndarray, num_frames: int) -> np.ndarray:
+        """log10 mel power of the first num_frames frames of a padded signal"""
+        if self.use_torch:
+            with torch.no_grad():
+                spec = torch.stft(
+                    torch.from_numpy(signal).cuda(non_blocking=True),
+                    self.n_fft,
+                    self.hop_length,
+                    window=self._torch_window,
+                    center=False,
+                    return_complex=True
+                )[:, :num_frames]
+                mel = self._torch_filters @ spec.abs().square()
+                return torch.log10(mel.clamp_(min=1e-10)).cpu().numpy()
+        
+        frames = np.lib.stride_tricks.sliding_window_view(signal, self.n_fft)[::self.hop_length][:num_frames]
+        spec = sp_fft.rfft(frames * self.window, axis=-1)
+        power = np.square(spec.real) + np.square(spec.imag)
+        mel = self.mel_filters @ power.T
+        return np.log10(np.maximum(mel, 1e-10))
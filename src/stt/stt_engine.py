@@ -4,14 +4,22 @@ Low-latency streaming speech recognition
 """
 
 import asyncio
+import math
+import os
+import threading
 import numpy as np
 from dataclasses import dataclass
-from typing import Optional, Callable, List
+from typing import Optional, Callable, Dict, List
 from loguru import logger
 import time
 
+from ..audio.kernels import i16_to_f32
+from .mel import MelFeatureExtractor
+
 try:
     from faster_whisper import WhisperModel
+    from faster_whisper.tokenizer import Tokenizer
+    import ctranslate2
     FASTER_WHISPER_AVAILABLE = True
 except ImportError:
     FASTER_WHISPER_AVAILABLE = False
@@ -39,14 +47,28 @@ class TranscriptionResult:
 class STTEngine:
     """Speech-to-Text engine with streaming support"""
     
+    # Whisper window; longer faster-whisper input is split and batch-decoded
+    CHUNK_SAMPLES = 30 * 16000
+    
+    # Chunk boundaries go at the quietest 20 ms frame in the last 2 s
+    SPLIT_SEARCH_SAMPLES = 2 * 16000
+    SPLIT_FRAME_SAMPLES = 320
+    
+    # Loaded faster-whisper models shared by all engines, keyed by load
+    # options (CTranslate2 models are safe to call from several threads)
+    _model_cache: Dict[tuple, "WhisperModel"] = {}
+    _model_cache_lock = threading.Lock()
+    
     def __init__(
         self,
         model_name: str = "base.en",
         language: str = "en",
         device: str = "auto",
-        compute_type: str = "float16",
+        compute_type: str = "auto",
         beam_size: int = 5,
-        enable_streaming: bool = True
+        enable_streaming: bool = True,
+        cpu_threads: int = 0,
+        num_workers: int = 1
     ):
         """
         Initialize STT engine
@@ -55,9 +77,13 @@ class STTEngine:
             model_name: Whisper model name (tiny, base, small, medium, large)
             language: Language code
             device: Device to use (auto, cpu, cuda)
-            compute_type: Computation type (float32, float16, int8)
+            compute_type: Computation type (auto, float32, float16, int8,
+                int8_float16); auto picks the fastest int8 type the device
+                supports
             beam_size: Beam size for decoding
             enable_streaming: Enable streaming recognition
+            cpu_threads: CTranslate2 CPU threads (0 uses all cores)
+            num_workers: Concurrent faster-whisper transcriptions
         """
         self.model_name = model_name
         self.language = language
@@ -65,12 +91,21 @@ class STTEngine:
         self.compute_type = compute_type
         self.beam_size = beam_size
         self.enable_streaming = enable_streaming
+        self.cpu_threads = cpu_threads or os.cpu_count() or 0
+        self.num_workers = num_workers
         
         self.model = None
         self.is_initialized = False
         
-        # Streaming state
-        self.audio_buffer = []
+        # Specialized partial-transcription path, built after model load
+        self._fast_transcribe: Optional[Callable[[np.ndarray], TranscriptionResult]] = None
+        
+        # Reusable int16 -> float32 conversion buffer (grown on demand)
+        self._f32_buf = np.empty(0, dtype=np.float32)
+        
+        # Streaming state: float32 samples in _stream_buf[:_stream_len]
+        self._stream_buf = np.empty(16000 * 10, dtype=np.float32)
+        self._stream_len = 0
         self.last_transcription = ""
         
         # Callbacks
@@ -87,19 +122,47 @@ class STTEngine:
         if self.is_initialized:
             return
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             if FASTER_WHISPER_AVAILABLE:
-                logger.info("Loading faster-whisper model...")
-                self.model = WhisperModel(
-                    self.model_name,
-                    device=self.device or "auto",
-                    compute_type=self.compute_type
+                device = self.device or (
+                    "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
                 )
+                if self.compute_type == "auto":
+                    self.compute_type = self._select_compute_type(device)
+                
+                key = (self.model_name, device, self.compute_type, self.cpu_threads, self.num_workers)
+                
+                # Held while loading so concurrent sessions load a model once
+                with STTEngine._model_cache_lock:
+                    self.model = STTEngine._model_cache.get(key)
+                    
+                    if self.model is None:
+                        logger.info(f"Loading faster-whisper model ({device}, {self.compute_type})...")
+                        self.model = WhisperModel(
+                            self.model_name,
+                            device=device,
+                            compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads,
+                            num_workers=self.num_workers
+                        )
+                        self.model.feature_extractor = MelFeatureExtractor(
+                            self.model.feature_extractor,
+                            device=device
+                        )
+                        self._warmup()
+                        STTEngine._model_cache[key] = self.model
+                    else:
+                        logger.info(f"Reusing loaded faster-whisper model ({device}, {self.compute_type})")
+                
                 self.engine_type = "faster-whisper"
+                self._fast_transcribe = self._build_streaming_transcriber()
                 
             elif WHISPER_AVAILABLE:
+                if self.compute_type == "auto":
+                    self.compute_type = "float16" if self.device == "cuda" else "float32"
+                
                 logger.info("Loading whisper model...")
                 self.model = whisper.load_model(
                     self.model_name,
@@ -110,7 +173,10 @@ class STTEngine:
             else:
                 raise RuntimeError("No speech recognition engine available")
             
-            load_time = time.time() - start_time
+            # 30 s at 16 kHz covers a full utterance without regrowing
+            self._f32_buf = np.empty(16000 * 30, dtype=np.float32)
+            
+            load_time = (time.perf_counter_ns() - start_time) / 1e9
             logger.info(f"Model loaded in {load_time:.2f}s")
             
             self.is_initialized = True
@@ -119,6 +185,111 @@ class STTEngine:
             logger.error(f"Failed to initialize STT engine: {e}")
             raise
     
+    @staticmethod
+    def _select_compute_type(device: str) -> str:
+        """
+        Pick the fastest compute type the device supports
+        
+        Decoding is bound by weight bandwidth, so int8 weights come first.
+        On GPUs, bfloat16 activations are preferred where supported (SM 8.0+,
+        which CTranslate2 checks): same tensor-core throughput as float16
+        without its overflow risk. CPUs use int8.
+        
+        Args:
+            device: CTranslate2 device (cpu, cuda)
+            
+        Returns:
+            Compute type name
+        """
+        supported = ctranslate2.get_supported_compute_types(device)
+        if device == "cuda":
+            preferred = ("int8_bfloat16", "int8_float16", "int8", "bfloat16", "float16")
+        else:
+            preferred = ("int8", "float32")
+        for compute_type in preferred:
+            if compute_type in supported:
+                return compute_type
+        return "default"
+    
+    def _warmup(self) -> None:
+        """Decode one second of silence so the first request skips kernel setup"""
+        segments, _ = self.model.transcribe(
+            np.zeros(16000, dtype=np.float32),
+            language=self.language,
+            beam_size=1,
+            vad_filter=False
+        )
+        for _ in segments:
+            pass
+    
+    def _build_streaming_transcriber(self) -> Callable[[np.ndarray], TranscriptionResult]:
+        """
+        Specialize partial transcription for the streaming buffer
+        
+        The stream buffer is always a contiguous 1-D float32 view and the
+        engine is fixed once loaded, so the closure skips transcribe()'s
+        conversions and dispatch. Partials are superseded by the final
+        pass, so they decode greedily without previous-text conditioning
+        or timestamp tokens (fewer decoder steps per partial).
+        """
+        model = self.model
+        language = self.language
+        
+        def transcribe_partial(audio_data: np.ndarray) -> TranscriptionResult:
+            segments, info = model.transcribe(
+                audio_data,
+                language=language,
+                beam_size=1,
+                temperature=0.0,
+                condition_on_previous_text=False,
+                without_timestamps=True,
+                vad_filter=False,
+                word_timestamps=False
+            )
+            full_text = []
+            total_confidence = 0.0
+            for segment in segments:
+                full_text.append(segment.text)
+                total_confidence += math.exp(segment.avg_logprob)
+            
+            return TranscriptionResult(
+                text=" ".join(full_text).strip(),
+                confidence=total_confidence / len(full_text) if full_text else 0.0,
+                is_partial=True,
+                language=info.language
+            )
+        
+        return transcribe_partial
+    
+    def _transcribe_partial(self, audio_data: np.ndarray) -> TranscriptionResult:
+        """Partial transcription of the stream buffer"""
+        if not self.is_initialized:
+            self.initialize()
+        
+        if self._fast_transcribe is None:
+            return self.transcribe(audio_data, is_final=False)
+        
+        start_time = time.perf_counter_ns()
+        
+        try:
+            result = self._fast_transcribe(audio_data)
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            return TranscriptionResult(
+                text="",
+                confidence=0.0,
+                is_partial=True,
+                processing_time=(time.perf_counter_ns() - start_time) / 1e9
+            )
+        
+        result.processing_time = (time.perf_counter_ns() - start_time) / 1e9
+        if self.on_partial_result:
+            self.on_partial_result(result)
+        
+        logger.debug("Partial transcription: '{}' (time={:.3f}s)", result.text, result.processing_time)
+        
+        return result
+    
     def transcribe(
         self,
         audio_data: np.ndarray,
@@ -128,7 +299,8 @@ class STTEngine:
         Transcribe audio data
         
         Args:
-            audio_data: Audio data as numpy array
+            audio_data: Audio data as numpy array (int16 PCM is converted
+                into a buffer reused by the next call)
             is_final: Whether this is the final transcription
             
         Returns:
@@ -137,27 +309,33 @@ class STTEngine:
         if not self.is_initialized:
             self.initialize()
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
-            # Ensure float32 format
-            if audio_data.dtype != np.float32:
-                if audio_data.dtype == np.int16:
-                    audio_data = audio_data.astype(np.float32) / 32768.0
-                else:
-                    audio_data = audio_data.astype(np.float32)
-            
-            # Flatten if needed
+            # Flatten if needed (no copy for contiguous input)
             if audio_data.ndim > 1:
-                audio_data = audio_data.flatten()
+                audio_data = audio_data.ravel()
+            
+            # Ensure float32 format
+            if audio_data.dtype == np.int16:
+                # Scale into the reusable buffer in one pass
+                n = audio_data.shape[0]
+                if self._f32_buf.shape[0] < n:
+                    self._f32_buf = np.empty(n, dtype=np.float32)
+                audio_data = i16_to_f32(audio_data, self._f32_buf[:n])
+            elif audio_data.dtype != np.float32:
+                audio_data = audio_data.astype(np.float32)
             
             # Transcribe based on engine type
             if self.engine_type == "faster-whisper":
-                result = self._transcribe_faster_whisper(audio_data)
+                if audio_data.shape[0] > self.CHUNK_SAMPLES:
+                    result = self._transcribe_faster_whisper_batched(audio_data)
+                else:
+                    result = self._transcribe_faster_whisper(audio_data)
             else:
                 result = self._transcribe_whisper(audio_data)
             
-            processing_time = time.time() - start_time
+            processing_time = (time.perf_counter_ns() - start_time) / 1e9
             result.processing_time = processing_time
             result.is_partial = not is_final
             
@@ -183,7 +361,7 @@ class STTEngine:
                 text="",
                 confidence=0.0,
                 is_partial=not is_final,
-                processing_time=time.time() - start_time
+                processing_time=(time.perf_counter_ns() - start_time) / 1e9
             )
     
     def _transcribe_faster_whisper(self, audio_data: np.ndarray) -> TranscriptionResult:
@@ -196,25 +374,26 @@ class STTEngine:
             word_timestamps=False
         )
         
-        # Collect segments
+        # Collect segments; confidence is the mean token probability
+        # (segments carry avg_logprob, not a confidence attribute)
         segments_list = []
         full_text = []
         total_confidence = 0.0
-        num_segments = 0
         
         for segment in segments:
+            text = segment.text
+            confidence = math.exp(segment.avg_logprob)
             segments_list.append({
-                "text": segment.text,
+                "text": text,
                 "start": segment.start,
                 "end": segment.end,
-                "confidence": getattr(segment, 'confidence', 0.0)
+                "confidence": confidence
             })
-            full_text.append(segment.text)
-            total_confidence += getattr(segment, 'confidence', 0.0)
-            num_segments += 1
+            full_text.append(text)
+            total_confidence += confidence
         
         text = " ".join(full_text).strip()
-        confidence = total_confidence / num_segments if num_segments > 0 else 0.0
+        confidence = total_confidence / len(segments_list) if segments_list else 0.0
         
         return TranscriptionResult(
             text=text,
@@ -224,6 +403,94 @@ class STTEngine:
             segments=segments_list
         )
     
+    def _split_long_audio(self, audio_data: np.ndarray) -> List[np.ndarray]:
+        """
+        Split audio into chunks of at most CHUNK_SAMPLES at quiet points
+        
+        Args:
+            audio_data: Float32 audio
+            
+        Returns:
+            Consecutive, non-overlapping chunks (views into audio_data)
+        """
+        frame = self.SPLIT_FRAME_SAMPLES
+        chunks = []
+        start = 0
+        
+        while audio_data.shape[0] - start > self.CHUNK_SAMPLES:
+            limit = start + self.CHUNK_SAMPLES
+            search = audio_data[limit - self.SPLIT_SEARCH_SAMPLES:limit]
+            energy = np.square(search).reshape(-1, frame).sum(axis=1)
+            split = limit - self.SPLIT_SEARCH_SAMPLES + int(np.argmin(energy)) * frame
+            chunks.append(audio_data[start:split])
+            start = split
+        
+        chunks.append(audio_data[start:])
+        return chunks
+    
+    def _transcribe_faster_whisper_batched(self, audio_data: np.ndarray) -> TranscriptionResult:
+        """
+        Transcribe audio longer than one Whisper window in a single batch
+        
+        Chunks are split at quiet points so no words straddle a boundary,
+        then encoded and decoded together by CTranslate2 instead of one
+        window at a time.
+        """
+        whisper_model = self.model.model
+        extractor = self.model.feature_extractor
+        tokenizer = Tokenizer(
+            self.model.hf_tokenizer,
+            whisper_model.is_multilingual,
+            task="transcribe",
+            language=self.language
+        )
+        
+        chunks = self._split_long_audio(audio_data)
+        features = np.stack([
+            extractor(chunk)[:, :extractor.nb_max_frames] for chunk in chunks
+        ])
+        encoder_output = whisper_model.encode(
+            ctranslate2.StorageView.from_array(np.ascontiguousarray(features))
+        )
+        
+        prompt = tokenizer.sot_sequence + [tokenizer.no_timestamps]
+        results = whisper_model.generate(
+            encoder_output,
+            [prompt] * len(chunks),
+            beam_size=self.beam_size,
+            return_scores=True
+        )
+        
+        segments_list = []
+        full_text = []
+        total_confidence = 0.0
+        offset = 0
+        
+        for chunk, result in zip(chunks, results):
+            tokens = result.sequences_ids[0]
+            text = tokenizer.decode(tokens).strip()
+            # scores are length-normalized; recover the mean token log prob
+            confidence = math.exp(result.scores[0] * len(tokens) / (len(tokens) + 1))
+            
+            segments_list.append({
+                "text": text,
+                "start": offset / 16000,
+                "end": (offset + chunk.shape[0]) / 16000,
+                "confidence": confidence
+            })
+            if text:
+                full_text.append(text)
+            total_confidence += confidence
+            offset += chunk.shape[0]
+        
+        return TranscriptionResult(
+            text=" ".join(full_text),
+            confidence=total_confidence / len(chunks),
+            is_partial=False,
+            language=tokenizer.language_code,
+            segments=segments_list
+        )
+    
     def _transcribe_whisper(self, audio_data: np.ndarray) -> TranscriptionResult:
         """Transcribe using standard whisper"""
         result = self.model.transcribe(
@@ -261,20 +528,30 @@ class STTEngine:
         if not self.enable_streaming:
             return None
         
-        self.audio_buffer.append(audio_chunk)
+        audio_chunk = audio_chunk.ravel()
+        start = self._stream_len
+        end = start + audio_chunk.shape[0]
         
-        # Check if we have enough audio for transcription
-        total_samples = sum(len(chunk) for chunk in self.audio_buffer)
+        if end > self._stream_buf.shape[0]:
+            grown = np.empty(max(end, 2 * self._stream_buf.shape[0]), dtype=np.float32)
+            grown[:start] = self._stream_buf[:start]
+            self._stream_buf = grown
+        
+        # Copy (and scale int16 PCM) straight into the stream buffer
+        if audio_chunk.dtype == np.int16:
+            i16_to_f32(audio_chunk, self._stream_buf[start:end])
+        else:
+            self._stream_buf[start:end] = audio_chunk
+        self._stream_len = end
         
         # Transcribe every 1 second of audio
-        if total_samples >= 16000:  # Assuming 16kHz sample rate
-            audio_data = np.concatenate(self.audio_buffer)
-            result = self.transcribe(audio_data, is_final=False)
+        if end >= 16000:  # Assuming 16kHz sample rate
+            result = self._transcribe_partial(self._stream_buf[:end])
             
             # Keep last 0.5 seconds for context
             overlap_samples = 8000
-            if len(audio_data) > overlap_samples:
-                self.audio_buffer = [audio_data[-overlap_samples:]]
+            self._stream_buf[:overlap_samples] = self._stream_buf[end - overlap_samples:end]
+            self._stream_len = overlap_samples
             
             return result
         
@@ -287,19 +564,18 @@ class STTEngine:
         Returns:
             Final transcription result
         """
-        if not self.audio_buffer:
+        if not self._stream_len:
             return None
         
-        audio_data = np.concatenate(self.audio_buffer)
-        result = self.transcribe(audio_data, is_final=True)
+        result = self.transcribe(self._stream_buf[:self._stream_len], is_final=True)
         
-        self.audio_buffer.clear()
+        self._stream_len = 0
         
         return result
     
     def reset(self) -> None:
         """Reset transcription state"""
-        self.audio_buffer.clear()
+        self._stream_len = 0
         self.last_transcription = ""
         logger.debug("STT state reset")
     
@@ -327,7 +603,13 @@ class STTEngine:
         return ["tiny", "tiny.en", "base", "base.en", "small", "small.en", 
                 "medium", "medium.en", "large"]
     
+    @classmethod
+    def clear_model_cache(cls) -> None:
+        """Drop shared models (engines already holding one keep it)"""
+        with cls._model_cache_lock:
+            cls._model_cache.clear()
+    
     def __del__(self):
-        """Cleanup"""
+        """Cleanup (a shared model stays loaded while the cache holds it)"""
         if self.model:
             del self.model
@@ -3,8 +3,12 @@ Text-to-Speech Engine
 Low-latency streaming speech synthesis
 """
 
+import os
+import re
 import numpy as np
 import time
+from functools import lru_cache
+from math import gcd
 from typing import Optional, Callable, Generator
 from loguru import logger
 import io
@@ -23,6 +27,36 @@ except ImportError:
     COQUI_AVAILABLE = False
     logger.warning("Coqui TTS not available")
 
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+    logger.warning("soxr not available, resampling with scipy")
+
+
+# pyttsx3 can only write to a path; keep that file in RAM where possible
+_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+@lru_cache(maxsize=8)
+def _resample_plan(orig_sr: int, target_sr: int) -> tuple:
+    """Up/down factors and anti-aliasing FIR taps (resample_poly's default design)"""
+    from scipy.signal import firwin
+    
+    g = gcd(orig_sr, target_sr)
+    up, down = target_sr // g, orig_sr // g
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps.setflags(write=False)
+    return up, down, taps
+
+
+# Streaming chunk boundaries: sentence end, or a comma/semicolon once a chunk is long enough
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_CLAUSE_BREAK = re.compile(r'(?<=[,;])\s+')
+MIN_CLAUSE_WORDS = 4
+
 
 class TTSEngine:
     """Text-to-Speech engine with streaming support"""
@@ -35,7 +69,10 @@ class TTSEngine:
         voice_speed: float = 1.0,
         voice_pitch: float = 1.0,
         voice_volume: float = 1.0,
-        enable_streaming: bool = True
+        enable_streaming: bool = True,
+        speaker_wav: Optional[str] = None,
+        language: str = "en",
+        compute_type: str = "float32"
     ):
         """
         Initialize TTS engine
@@ -48,6 +85,10 @@ class TTSEngine:
             voice_pitch: Pitch multiplier
             voice_volume: Volume level (0.0 to 1.0)
             enable_streaming: Enable streaming synthesis
+            speaker_wav: Reference recording for voice-cloning models (XTTS)
+            language: Language code for multilingual models
+            compute_type: Coqui model precision (float32, int8); int8
+                applies dynamic weight quantization to Linear/LSTM layers
         """
         self.engine_type = engine
         self.model_name = model_name
@@ -56,8 +97,14 @@ class TTSEngine:
         self.voice_pitch = voice_pitch
         self.voice_volume = voice_volume
         self.enable_streaming = enable_streaming
+        self.speaker_wav = speaker_wav
+        self.language = language
+        self.compute_type = compute_type
         
         self.engine = None
+        
+        # XTTS speaker conditioning, computed on first streamed sentence
+        self._speaker_latents = None
         self.is_initialized = False
         
         # Callbacks
@@ -74,7 +121,7 @@ class TTSEngine:
         if self.is_initialized:
             return
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             if self.engine_type == "pyttsx3" and PYTTSX3_AVAILABLE:
@@ -89,7 +136,7 @@ class TTSEngine:
                 else:
                     raise RuntimeError("No TTS engine available")
             
-            load_time = time.time() - start_time
+            load_time = (time.perf_counter_ns() - start_time) / 1e9
             logger.info(f"TTS engine loaded in {load_time:.2f}s")
             
             self.is_initialized = True
@@ -119,6 +166,33 @@ class TTSEngine:
         
         self.engine = CoquiTTS(model_name=self.model_name)
         self.engine_type = "coqui"
+        
+        if self.compute_type == "int8":
+            self._quantize_coqui()
+    
+    def _quantize_coqui(self) -> None:
+        """Quantize the Coqui acoustic model and vocoder weights to int8"""
+        import torch
+        
+        synthesizer = self.engine.synthesizer
+        
+        # Dynamic quantization only has CPU kernels
+        if next(synthesizer.tts_model.parameters()).is_cuda:
+            logger.warning("int8 TTS quantization is CPU-only, keeping the GPU model as is")
+            return
+        
+        # Weights become qint8; activations are quantized per batch, so no
+        # calibration pass is needed
+        layers = {torch.nn.Linear, torch.nn.LSTM}
+        synthesizer.tts_model = torch.ao.quantization.quantize_dynamic(
+            synthesizer.tts_model, layers, dtype=torch.qint8
+        )
+        if getattr(synthesizer, "vocoder_model", None) is not None:
+            synthesizer.vocoder_model = torch.ao.quantization.quantize_dynamic(
+                synthesizer.vocoder_model, layers, dtype=torch.qint8
+            )
+        
+        logger.info("Coqui TTS model quantized to int8")
     
     def synthesize(
         self,
@@ -141,7 +215,7 @@ class TTSEngine:
         if not text.strip():
             return np.array([], dtype=np.float32)
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Notify start
         if self.on_synthesis_start:
@@ -156,7 +230,7 @@ class TTSEngine:
             else:
                 audio_data = np.array([], dtype=np.float32)
             
-            synthesis_time = time.time() - start_time
+            synthesis_time = (time.perf_counter_ns() - start_time) / 1e9
             
             logger.debug(
                 f"Synthesized: '{text[:50]}...' "
@@ -174,12 +248,12 @@ class TTSEngine:
             return np.array([], dtype=np.float32)
     
     def _synthesize_pyttsx3(self, text: str) -> np.ndarray:
-        """Synthesize using pyttsx3 (file-based)"""
+        """Synthesize using pyttsx3 (file-based, tmpfs when available)"""
         import tempfile
         import soundfile as sf
         
         # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
+        with tempfile.NamedTemporaryFile(suffix='.wav', dir=_TMP_DIR, delete=False) as tmp_file:
             tmp_path = tmp_file.name
         
         try:
@@ -187,12 +261,9 @@ class TTSEngine:
             self.engine.save_to_file(text, tmp_path)
             self.engine.runAndWait()
             
-            # Read audio file
-            audio_data, sample_rate = sf.read(tmp_path)
-            
-            # Convert to float32
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
+            # Decode straight to float32 (a fresh array: it is queued for
+            # playback while the next chunk is synthesized)
+            audio_data, sample_rate = sf.read(tmp_path, dtype='float32')
             
             # Resample if needed
             if sample_rate != self.sample_rate:
@@ -202,7 +273,6 @@ class TTSEngine:
             
         finally:
             # Clean up temp file
-            import os
             try:
                 os.unlink(tmp_path)
             except:
@@ -219,6 +289,57 @@ class TTSEngine:
         
         return audio_data
     
+    def _native_stream_model(self):
+        """Coqui model with incremental inference (XTTS), if configured"""
+        if self.engine_type != "coqui" or not self.speaker_wav:
+            return None
+        model = getattr(getattr(self.engine, "synthesizer", None), "tts_model", None)
+        return model if hasattr(model, "inference_stream") else None
+    
+    def stream_sentence(self, text: str) -> Generator[np.ndarray, None, None]:
+        """
+        Synthesize one sentence, yielding audio as soon as it is produced
+        
+        XTTS models emit vocoder chunks while decoding; other engines
+        yield the whole sentence once synthesized.
+        
+        Args:
+            text: Input text
+            
+        Yields:
+            Audio chunks as numpy arrays
+        """
+        if not self.is_initialized:
+            self.initialize()
+        
+        model = self._native_stream_model()
+        if model is None or not text.strip():
+            audio_data = self.synthesize(text, streaming=True)
+            if len(audio_data) > 0:
+                yield audio_data
+            return
+        
+        if self.on_synthesis_start:
+            self.on_synthesis_start(text)
+        
+        if self._speaker_latents is None:
+            self._speaker_latents = model.get_conditioning_latents(audio_path=[self.speaker_wav])
+        gpt_cond_latent, speaker_embedding = self._speaker_latents
+        
+        chunks = []
+        try:
+            for chunk in model.inference_stream(text, self.language, gpt_cond_latent, speaker_embedding):
+                audio_chunk = chunk.detach().cpu().numpy().astype(np.float32, copy=False).ravel()
+                chunks.append(audio_chunk)
+                yield audio_chunk
+        except Exception as e:
+            logger.error(f"Streaming synthesis error: {e}")
+        finally:
+            if self.on_synthesis_end:
+                self.on_synthesis_end(
+                    np.concatenate(chunks) if chunks else np.array([], dtype=np.float32)
+                )
+    
     def synthesize_streaming(
         self,
         text: str,
@@ -235,26 +356,42 @@ class TTSEngine:
             Audio chunks as numpy arrays
         """
         # Split text into sentences
-        sentences = self._split_into_sentences(text)
+        sentences = self.split_sentences(text)
         
         for sentence in sentences:
-            # Synthesize sentence
-            audio_data = self.synthesize(sentence, streaming=True)
-            
-            # Yield chunks
-            for i in range(0, len(audio_data), chunk_size):
-                chunk = audio_data[i:i + chunk_size]
-                yield chunk
+            # Synthesize sentence, passing audio on as it is produced
+            for audio_data in self.stream_sentence(sentence):
+                # Yield chunks (views, no copies)
+                for i in range(0, len(audio_data), chunk_size):
+                    yield audio_data[i:i + chunk_size]
     
-    def _split_into_sentences(self, text: str) -> list:
-        """Split text into sentences for streaming"""
-        import re
+    def split_sentences(self, text: str) -> list:
+        """
+        Split text into chunks that can be synthesized independently
         
-        # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        Chunks end at sentence punctuation (.!?), or at a comma or
+        semicolon once the chunk has MIN_CLAUSE_WORDS words, so the first audio is ready
+        before the whole reply is synthesized.
         
-        return sentences
+        Args:
+            text: Input text
+            
+        Returns:
+            List of text chunks
+        """
+        chunks = []
+        
+        for sentence in _SENTENCE_END.split(text.strip()):
+            current = ""
+            for clause in _CLAUSE_BREAK.split(sentence):
+                current = f"{current} {clause}" if current else clause
+                if current.endswith((",", ";")) and len(current.split()) >= MIN_CLAUSE_WORDS:
+                    chunks.append(current)
+                    current = ""
+            if current.strip():
+                chunks.append(current.strip())
+        
+        return chunks
     
     def _resample(
         self,
@@ -262,13 +399,16 @@ class TTSEngine:
         orig_sr: int,
         target_sr: int
     ) -> np.ndarray:
-        """Resample audio data"""
+        """Resample audio data (polyphase, not FFT-based)"""
+        if SOXR_AVAILABLE:
+            return soxr.resample(audio_data, orig_sr, target_sr, quality='HQ')
+        
         from scipy import signal
         
-        num_samples = int(len(audio_data) * target_sr / orig_sr)
-        resampled = signal.resample(audio_data, num_samples)
+        up, down, taps = _resample_plan(orig_sr, target_sr)
+        resampled = signal.resample_poly(audio_data, up, down, window=taps)
         
-        return resampled.astype(np.float32)
+        return resampled.astype(np.float32, copy=False)
     
     def set_voice(self, voice_id: int) -> None:
         """
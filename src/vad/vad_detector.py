@@ -5,11 +5,26 @@ Real-time speech detection with minimal latency
 
 import collections
 import numpy as np
-import webrtcvad
 from loguru import logger
 from typing import Optional, Callable
 from dataclasses import dataclass
 
+from ..audio.kernels import f32_to_i16, i16_to_f32
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+    logger.warning("webrtcvad not available, WebRTC VAD backend disabled")
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    logger.warning("onnxruntime not available, Silero VAD backend disabled")
+
 
 @dataclass
 class VADState:
@@ -21,7 +36,7 @@ class VADState:
 
 
 class VADDetector:
-    """Voice Activity Detector using WebRTC VAD"""
+    """Voice Activity Detector using WebRTC VAD or a Silero ONNX model"""
     
     def __init__(
         self,
@@ -29,7 +44,10 @@ class VADDetector:
         frame_duration_ms: int = 30,
         aggressiveness: int = 3,
         padding_duration_ms: int = 300,
-        min_speech_duration_ms: int = 250
+        min_speech_duration_ms: int = 250,
+        backend: str = "webrtc",
+        model_path: Optional[str] = None,
+        speech_threshold: float = 0.5
     ):
         """
         Initialize VAD detector
@@ -40,6 +58,10 @@ class VADDetector:
             aggressiveness: VAD aggressiveness (0-3, higher = more aggressive)
             padding_duration_ms: Padding duration around speech
             min_speech_duration_ms: Minimum speech duration to trigger
+            backend: Speech classifier (webrtc, silero)
+            model_path: Silero VAD ONNX model (int8 recommended), for the
+                silero backend
+            speech_threshold: Silero speech probability threshold
         """
         if sample_rate not in [8000, 16000, 32000, 48000]:
             raise ValueError(f"Unsupported sample rate: {sample_rate}")
@@ -50,60 +72,177 @@ class VADDetector:
         if not 0 <= aggressiveness <= 3:
             raise ValueError(f"Aggressiveness must be 0-3, got {aggressiveness}")
         
+        if backend not in ("webrtc", "silero"):
+            raise ValueError(f"Unsupported VAD backend: {backend}")
+        
         self.sample_rate = sample_rate
         self.frame_duration_ms = frame_duration_ms
         self.aggressiveness = aggressiveness
+        self.backend = backend
+        self.speech_threshold = speech_threshold
         
         # Calculate frame parameters
         self.frame_size = int(sample_rate * frame_duration_ms / 1000)
         self.num_padding_frames = int(padding_duration_ms / frame_duration_ms)
         self.num_min_speech_frames = int(min_speech_duration_ms / frame_duration_ms)
         
-        # Initialize WebRTC VAD
-        self.vad = webrtcvad.Vad(aggressiveness)
+        # Reused int16 frame for float and short input, plus a byte view
+        # of it webrtcvad reads without a tobytes() copy
+        self._frame_i16 = np.zeros(self.frame_size, dtype=np.int16)
+        self._frame_bytes = memoryview(self._frame_i16).cast('B')
+        
+        # Initialize the classifier
+        self.vad = None
+        self.session = None
+        if backend == "silero":
+            self._init_silero(model_path)
+        elif WEBRTCVAD_AVAILABLE:
+            self.vad = webrtcvad.Vad(aggressiveness)
+        else:
+            raise RuntimeError("webrtcvad is required for the webrtc VAD backend")
         
         # State tracking
         self.state = VADState()
         self.ring_buffer = collections.deque(maxlen=self.num_padding_frames)
         self.triggered = False
         
+        # Speech flags parallel to ring_buffer, with a running voiced count
+        self._voiced = collections.deque(maxlen=self.num_padding_frames)
+        self._voiced_count = 0
+        
         # Callbacks
         self.on_speech_start: Optional[Callable] = None
         self.on_speech_end: Optional[Callable] = None
         
         logger.info(
-            f"VADDetector initialized: {sample_rate}Hz, "
+            f"VADDetector initialized: {backend}, {sample_rate}Hz, "
             f"{frame_duration_ms}ms frames, aggressiveness={aggressiveness}"
         )
     
+    def _init_silero(self, model_path: Optional[str]) -> None:
+        """Load the Silero model and its streaming state"""
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is required for the silero VAD backend")
+        if not model_path:
+            raise ValueError("model_path is required for the silero VAD backend")
+        if self.sample_rate not in (8000, 16000):
+            raise ValueError(f"Silero VAD supports 8000 or 16000 Hz, got {self.sample_rate}")
+        
+        # One thread: each call is tiny and latency-bound
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        
+        # Silero v5 windows, each prefixed with the tail of the previous one
+        self.silero_window = 512 if self.sample_rate == 16000 else 256
+        self._silero_context_size = 64 if self.sample_rate == 16000 else 32
+        self._silero_sr = np.array(self.sample_rate, dtype=np.int64)
+        self._silero_input = np.zeros(
+            (1, self._silero_context_size + self.silero_window), dtype=np.float32
+        )
+        self._silero_pending = np.zeros(0, dtype=np.float32)
+        self._silero_last = False
+        self._reset_silero()
+        
+        logger.info(f"Silero VAD model loaded: {model_path}")
+    
+    def _reset_silero(self) -> None:
+        """Clear the Silero recurrent state and window context"""
+        self._silero_state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._silero_input[:] = 0.0
+        self._silero_pending = self._silero_pending[:0]
+        self._silero_last = False
+    
+    def process_frames_batch(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Speech probabilities for consecutive Silero windows
+        
+        The model is recurrent, so windows of one stream are evaluated in
+        order with the state carried across them; this runs them all in
+        one call instead of one is_speech() round trip each.
+        
+        Args:
+            frames: (B, silero_window) float32 windows in time order
+            
+        Returns:
+            (B,) speech probabilities
+        """
+        if self.session is None:
+            raise RuntimeError("process_frames_batch requires the silero VAD backend")
+        
+        context = self._silero_context_size
+        model_input = self._silero_input
+        probs = np.empty(frames.shape[0], dtype=np.float32)
+        
+        for i in range(frames.shape[0]):
+            model_input[0, context:] = frames[i]
+            output, self._silero_state = self.session.run(
+                None,
+                {"input": model_input, "state": self._silero_state, "sr": self._silero_sr}
+            )
+            probs[i] = output[0, 0]
+            model_input[0, :context] = model_input[0, -context:]
+        
+        return probs
+    
+    def _silero_is_speech(self, audio_frame: np.ndarray) -> bool:
+        """Classify a chunk of any length with the Silero model"""
+        audio_frame = audio_frame.ravel()
+        if audio_frame.dtype == np.int16:
+            audio_frame = i16_to_f32(audio_frame, np.empty(audio_frame.shape[0], dtype=np.float32))
+        
+        # Whole windows go to the model; the remainder waits for the next chunk
+        samples = np.concatenate((self._silero_pending, audio_frame.astype(np.float32, copy=False)))
+        num_windows = samples.shape[0] // self.silero_window
+        split = num_windows * self.silero_window
+        self._silero_pending = samples[split:]
+        
+        if num_windows:
+            probs = self.process_frames_batch(samples[:split].reshape(num_windows, self.silero_window))
+            self._silero_last = bool(probs.max() >= self.speech_threshold)
+        
+        return self._silero_last
+    
     def is_speech(self, audio_frame: np.ndarray) -> bool:
         """
         Detect if audio frame contains speech
         
         Args:
-            audio_frame: Audio data (must be frame_size samples)
+            audio_frame: Audio data (must be frame_size samples for the
+                webrtc backend; any length for silero)
             
         Returns:
             True if speech detected
         """
-        # Convert to int16 if needed
+        if self.session is not None:
+            try:
+                return self._silero_is_speech(audio_frame)
+            except Exception as e:
+                logger.error(f"VAD error: {e}")
+                return False
+        
+        num_samples = min(len(audio_frame), self.frame_size)
+        
         if audio_frame.dtype != np.int16:
-            audio_frame = (audio_frame * 32768).astype(np.int16)
-        
-        # Ensure correct size
-        if len(audio_frame) != self.frame_size:
-            # Pad or truncate
-            if len(audio_frame) < self.frame_size:
-                audio_frame = np.pad(
-                    audio_frame,
-                    (0, self.frame_size - len(audio_frame)),
-                    mode='constant'
-                )
-            else:
-                audio_frame = audio_frame[:self.frame_size]
-        
-        # Convert to bytes
-        audio_bytes = audio_frame.tobytes()
+            # Convert into the reused frame, zero-padding short input
+            f32_to_i16(audio_frame[:num_samples], self._frame_i16[:num_samples])
+            self._frame_i16[num_samples:] = 0
+            audio_bytes = self._frame_bytes
+        elif num_samples == self.frame_size and audio_frame.flags.c_contiguous:
+            # Hand the caller's samples over as-is
+            audio_bytes = memoryview(audio_frame[:num_samples]).cast('B')
+        else:
+            # Copy into the reused frame, zero-padding short input
+            self._frame_i16[:num_samples] = audio_frame[:num_samples]
+            self._frame_i16[num_samples:] = 0
+            audio_bytes = self._frame_bytes
         
         try:
             return self.vad.is_speech(audio_bytes, self.sample_rate)
@@ -132,14 +271,16 @@ class VADDetector:
             if self.state.speech_frames > 0:
                 self.state.speech_frames = 0
         
-        # Add to ring buffer
-        self.ring_buffer.append((audio_frame, is_speech))
+        # Add to ring buffer, keeping the voiced count in step with eviction
+        if len(self._voiced) == self._voiced.maxlen and self._voiced:
+            self._voiced_count -= self._voiced[0]
+        self.ring_buffer.append(audio_frame)
+        self._voiced.append(is_speech)
+        self._voiced_count += is_speech
         
         # Check for speech start
         if not self.triggered:
-            num_voiced = len([f for f, speech in self.ring_buffer if speech])
-            
-            if num_voiced > 0.5 * self.ring_buffer.maxlen:
+            if self._voiced_count > 0.5 * self.ring_buffer.maxlen:
                 self.triggered = True
                 self.state.speech_started = True
                 
@@ -150,13 +291,13 @@ class VADDetector:
                 logger.debug("Speech started")
                 
                 # Return buffered frames
-                voiced_frames = [f[0] for f in self.ring_buffer]
-                self.ring_buffer.clear()
+                voiced_frames = list(self.ring_buffer)
+                self._clear_ring()
                 return True, voiced_frames
         
         # Check for speech end
         else:
-            num_unvoiced = len([f for f, speech in self.ring_buffer if not speech])
+            num_unvoiced = len(self._voiced) - self._voiced_count
             
             if num_unvoiced > 0.9 * self.ring_buffer.maxlen:
                 self.triggered = False
@@ -169,18 +310,26 @@ class VADDetector:
                 logger.debug("Speech ended")
                 
                 # Return final frames
-                voiced_frames = [f[0] for f in self.ring_buffer]
-                self.ring_buffer.clear()
+                voiced_frames = list(self.ring_buffer)
+                self._clear_ring()
                 return False, voiced_frames
         
         # Return current state
         return self.triggered, None
     
+    def _clear_ring(self) -> None:
+        """Empty the ring buffer and its speech flags"""
+        self.ring_buffer.clear()
+        self._voiced.clear()
+        self._voiced_count = 0
+    
     def reset(self) -> None:
         """Reset VAD state"""
         self.state = VADState()
-        self.ring_buffer.clear()
+        self._clear_ring()
         self.triggered = False
+        if self.session is not None:
+            self._reset_silero()
         logger.debug("VAD state reset")
     
     def set_aggressiveness(self, level: int) -> None:
@@ -188,13 +337,14 @@ class VADDetector:
         Set VAD aggressiveness level
         
         Args:
-            level: Aggressiveness level (0-3)
+            level: Aggressiveness level (0-3, used by the webrtc backend)
         """
         if not 0 <= level <= 3:
             raise ValueError(f"Aggressiveness must be 0-3, got {level}")
         
         self.aggressiveness = level
-        self.vad.set_mode(level)
+        if self.vad is not None:
+            self.vad.set_mode(level)
         logger.info(f"VAD aggressiveness set to {level}")
     
     def register_callbacks(
@@ -3,6 +3,9 @@
 import pytest
 import numpy as np
 from src.audio import AudioProcessor
+from src.audio.kernels import (
+    i16_to_f32, mean_square, below_mean_square, rms, preemphasis, peak_abs, peak_normalize, f32_to_i16
+)
 
 
 class TestAudioProcessor:
@@ -28,6 +31,44 @@ class TestAudioProcessor:
         assert len(processed) == len(audio_data)
         assert processed.dtype == np.float32
     
+    def test_process_pcm_bytes(self):
+        """Test PCM16 bytes are processed like the equivalent int16 array"""
+        processor = AudioProcessor()
+        pcm = (np.random.randn(1600) * 3000).astype(np.int16)
+        
+        expected = processor.process(pcm)
+        processor.reset()
+        
+        np.testing.assert_allclose(processor.process(pcm.tobytes()), expected, rtol=1e-5, atol=1e-6)
+    
+    def test_process_int16_audio(self):
+        """Test int16 input is processed as float32"""
+        processor = AudioProcessor(sample_rate=16000)
+        audio_data = (np.random.randn(1600) * 1000).astype(np.int16)
+        
+        processed = processor.process(audio_data)
+        
+        assert processed.dtype == np.float32
+        assert np.abs(processed).max() == pytest.approx(0.9, rel=1e-5)
+    
+    def test_fused_matches_staged(self):
+        """Test the fused kernel path matches the step-by-step path"""
+        audio_data = np.random.randn(1600).astype(np.float32)
+        
+        fused = AudioProcessor(sample_rate=16000).process(audio_data)
+        staged = AudioProcessor(sample_rate=16000)._process_staged(audio_data)
+        
+        np.testing.assert_allclose(fused, staged, rtol=1e-3, atol=1e-4)
+    
+    def test_int16_matches_float32(self):
+        """Test int16 input gives the same result as pre-scaled float32"""
+        pcm = (np.random.randn(1600) * 1000).astype(np.int16)
+        
+        from_int16 = AudioProcessor(sample_rate=16000).process(pcm)
+        from_float = AudioProcessor(sample_rate=16000).process(pcm / np.float32(32768.0))
+        
+        np.testing.assert_allclose(from_int16, from_float, rtol=1e-4, atol=1e-5)
+    
     def test_normalize(self):
         """Test audio normalization"""
         processor = AudioProcessor(sample_rate=16000)
@@ -52,6 +93,46 @@ class TestAudioProcessor:
         signal = np.random.randn(1600).astype(np.float32) * 0.5
         assert processor.detect_silence(signal) is False
     
+    def test_noise_filter_streams_across_chunks(self):
+        """Test high-pass state carries across chunks"""
+        audio_data = np.random.randn(3200).astype(np.float32)
+        
+        whole = AudioProcessor(sample_rate=16000)._reduce_noise(audio_data)
+        
+        processor = AudioProcessor(sample_rate=16000)
+        chunked = np.concatenate([
+            processor._reduce_noise(audio_data[:1600]),
+            processor._reduce_noise(audio_data[1600:])
+        ])
+        
+        assert chunked.dtype == np.float32
+        np.testing.assert_allclose(chunked, whole, rtol=1e-5, atol=1e-5)
+    
+    def test_bandpass_streams_across_chunks(self):
+        """Test speech-band state carries across chunks and resets"""
+        audio_data = np.random.randn(3200).astype(np.float32)
+        
+        processor = AudioProcessor(sample_rate=16000)
+        whole = processor.apply_bandpass_filter(audio_data)
+        
+        processor.reset()
+        chunked = np.concatenate([
+            processor.apply_bandpass_filter(audio_data[:1600]),
+            processor.apply_bandpass_filter(audio_data[1600:])
+        ])
+        
+        np.testing.assert_allclose(chunked, whole, rtol=1e-5, atol=1e-5)
+    
+    def test_resample(self):
+        """Test polyphase resampling length"""
+        processor = AudioProcessor(sample_rate=16000)
+        audio_data = np.random.randn(1600).astype(np.float32)
+        
+        resampled = processor.resample(audio_data, 48000)
+        
+        assert len(resampled) == 4800
+        assert processor.resample(audio_data, 16000) is audio_data
+    
     def test_calculate_energy(self):
         """Test energy calculation"""
         processor = AudioProcessor(sample_rate=16000)
@@ -63,5 +144,80 @@ class TestAudioProcessor:
         assert energy == pytest.approx(0.5, rel=1e-3)
 
 
+class TestAudioKernels:
+    """Test audio kernels"""
+    
+    def test_i16_to_f32(self):
+        """Test int16 to float32 conversion into a preallocated buffer"""
+        pcm = np.array([0, 16384, -32768, 32767], dtype=np.int16)
+        out = np.empty(len(pcm), dtype=np.float32)
+        
+        result = i16_to_f32(pcm, out)
+        
+        assert result is out
+        assert out.dtype == np.float32
+        np.testing.assert_allclose(out, pcm / 32768.0, rtol=1e-6)
+    
+    def test_i16_to_f32_memoryview(self):
+        """Test conversion straight from a raw bytes memoryview"""
+        pcm = np.array([1, -2, 3, -4], dtype=np.int16)
+        out = np.empty(len(pcm), dtype=np.float32)
+        
+        i16_to_f32(memoryview(pcm.tobytes()).cast("h"), out)
+        
+        np.testing.assert_allclose(out, pcm / 32768.0, rtol=1e-6)
+    
+    def test_rms(self):
+        """Test single-pass RMS"""
+        audio = np.random.randn(4096).astype(np.float32)
+        
+        assert rms(audio) == pytest.approx(np.sqrt(np.mean(audio ** 2)), rel=1e-4)
+        assert rms(np.zeros(0, dtype=np.float32)) == 0.0
+    
+    def test_mean_square_int16(self):
+        """Test mean square of int16 PCM does not overflow"""
+        audio = np.full(1024, 30000, dtype=np.int16)
+        
+        assert mean_square(audio) == pytest.approx(30000.0 ** 2)
+    
+    def test_below_mean_square(self):
+        """Test the early-exit silence bound matches the mean square"""
+        audio = np.random.randn(1000).astype(np.float32) * 0.1
+        limit = float(np.mean(audio.astype(np.float64) ** 2))
+        
+        assert below_mean_square(audio, limit * 1.01) is True
+        assert below_mean_square(audio, limit * 0.99) is False
+        assert below_mean_square(np.ones(4096, dtype=np.float32), 1e-4) is False
+        assert below_mean_square(np.zeros(0, dtype=np.float32), 1e-4) is True
+    
+    def test_preemphasis(self):
+        """Test pre-emphasis matches the reference difference equation"""
+        audio = np.random.randn(1600).astype(np.float32)
+        expected = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+        
+        np.testing.assert_allclose(preemphasis(audio, 0.97), expected, rtol=1e-5, atol=1e-6)
+    
+    def test_peak_abs(self):
+        """Test absolute peak"""
+        assert peak_abs(np.array([0.2, -1.5, 0.7], dtype=np.float32)) == pytest.approx(1.5)
+        assert peak_abs(np.zeros(0, dtype=np.float32)) == 0.0
+    
+    def test_peak_normalize(self):
+        """Test peak normalization"""
+        audio = np.array([0.1, -0.5, 0.25], dtype=np.float32)
+        
+        assert np.abs(peak_normalize(audio, 0.9)).max() == pytest.approx(0.9)
+        assert not peak_normalize(np.zeros(4, dtype=np.float32), 0.9).any()
+    
+    def test_f32_to_i16_saturates(self):
+        """Test float to int16 conversion clips instead of wrapping"""
+        audio = np.array([0.0, 0.5, 1.0, -1.5], dtype=np.float32)
+        out = np.empty(len(audio), dtype=np.int16)
+        
+        f32_to_i16(audio, out)
+        
+        assert out.tolist() == [0, 16384, 32767, -32768]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
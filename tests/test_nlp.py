@@ -1,5 +1,7 @@
 """Tests for NLP modules"""
 
+import threading
+import time
 import pytest
 from src.nlp import IntentClassifier, ContextManager
 
@@ -55,6 +57,36 @@ class TestIntentClassifier:
         intent = classifier.classify("asdfghjkl qwertyuiop")
         
         assert intent.name == "unknown"
+    
+    def test_classify_batch(self):
+        """Test batch classification matches per-text classification"""
+        classifier = IntentClassifier()
+        texts = ["Goodbye, see you later!", "asdfghjkl qwertyuiop", "Can you repeat that?"]
+        
+        intents = classifier.classify_batch(texts)
+        
+        assert [i.raw_text for i in intents] == texts
+        for intent, text in zip(intents, texts):
+            single = classifier.classify(text)
+            assert intent.name == single.name
+            assert intent.confidence == single.confidence
+            assert intent.entities == single.entities
+        assert classifier.classify_batch([]) == []
+    
+    def test_classify_cache(self):
+        """Test repeated texts reuse results without sharing entity dicts"""
+        classifier = IntentClassifier(cache_size=1)
+        
+        first = classifier.classify("Goodbye, see you later!")
+        first.entities["extra"] = "changed"
+        second = classifier.classify("Goodbye, see you later!")
+        
+        assert second.name == first.name == "goodbye"
+        assert second.confidence == first.confidence
+        assert "extra" not in second.entities
+        
+        classifier.classify("Hello!")
+        assert list(classifier._cache) == ["Hello!"]
 
 
 class TestContextManager:
@@ -93,6 +125,24 @@ class TestContextManager:
         assert context.turns[0].speaker == "user"
         assert context.turns[0].text == "Hello!"
     
+    def test_add_turns(self):
+        """Test adding several turns at once"""
+        manager = ContextManager(max_history=3)
+        context = manager.create_context("test_session")
+        manager.add_turn("user", "First")
+        
+        manager.add_turns([
+            {"speaker": "user", "text": "Hello!", "intent": "greeting", "timestamp": 1.0},
+            {"speaker": "assistant", "text": "Hi there!"}
+        ])
+        
+        assert [t.text for t in context.turns] == ["First", "Hello!", "Hi there!"]
+        assert context.turns[1].intent == "greeting"
+        assert context.turns[1].timestamp == 1.0
+        assert context.turns[2].entities == {}
+        assert manager.get_last_turn(speaker="user").text == "Hello!"
+        assert context.last_activity >= context.turns[0].timestamp
+    
     def test_get_last_turn(self):
         """Test getting last turn"""
         manager = ContextManager()
@@ -104,6 +154,9 @@ class TestContextManager:
         last_turn = manager.get_last_turn()
         assert last_turn.speaker == "assistant"
         assert last_turn.text == "Hi there!"
+        
+        assert manager.get_last_turn(speaker="user").text == "Hello!"
+        assert manager.get_last_turn(speaker="system") is None
     
     def test_history_limit(self):
         """Test history limit"""
@@ -115,6 +168,74 @@ class TestContextManager:
             manager.add_turn("user", f"Message {i}")
         
         assert len(context.turns) == 3
+        assert [t.text for t in manager.get_history()] == [
+            "Message 2", "Message 3", "Message 4"
+        ]
+        assert [t.text for t in manager.get_history(limit=2)] == ["Message 3", "Message 4"]
+        
+        manager.add_turn("assistant", "Reply")
+        assert [t.text for t in manager.get_history(speaker="assistant")] == ["Reply"]
+        assert [t.text for t in manager.get_history(limit=1, speaker="user")] == ["Message 4"]
+    
+    def test_context_expiry(self):
+        """Test idle contexts expire and active ones survive"""
+        manager = ContextManager(context_timeout=0.2)
+        manager.create_context("idle")
+        manager.create_context("active")
+        
+        time.sleep(0.15)
+        manager.add_turn("user", "Still here")
+        time.sleep(0.1)
+        
+        assert manager.get_context("idle") is None
+        assert manager.get_context("active") is not None
+        assert manager.cleanup_expired_contexts() == 0
+    
+    def test_session_cap(self):
+        """Test creating past max_sessions evicts the least recently active"""
+        manager = ContextManager(max_sessions=2)
+        manager.create_context("a")
+        manager.create_context("b")
+        manager.add_turn("user", "Hello", session_id="a")
+        
+        manager.create_context("c")
+        
+        assert set(manager.contexts) == {"a", "c"}
+        assert manager.current_context.session_id == "c"
+    
+    def test_concurrent_sessions(self):
+        """Test turns from concurrent sessions all land in their contexts"""
+        manager = ContextManager(max_history=100)
+        
+        def run_session(i):
+            manager.create_context(f"session_{i}")
+            for j in range(50):
+                manager.add_turn("user", f"Message {j}", session_id=f"session_{i}")
+        
+        threads = [threading.Thread(target=run_session, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(manager.contexts) == 8
+        for i in range(8):
+            assert len(manager.get_history(session_id=f"session_{i}")) == 50
+    
+    def test_context_summary(self):
+        """Test summary view reflects the live context"""
+        manager = ContextManager()
+        manager.create_context("test_session", language="es")
+        
+        summary = manager.get_context_summary()
+        manager.add_turn("user", "Hola")
+        
+        assert summary["language"] == "es"
+        assert summary["turn_count"] == 1
+        assert set(dict(summary)) == {
+            "session_id", "language", "scenario", "turn_count",
+            "duration", "last_activity", "user_profile"
+        }
     
     def test_set_scenario(self):
         """Test setting scenario"""
@@ -44,6 +44,26 @@ class TestResponseGenerator:
         
         assert generator.stats["cache_hits"] > 0
     
+    def test_cache_evicts_least_recently_used(self):
+        """Test a cache hit protects an entry from eviction"""
+        generator = ResponseGenerator(enable_cache=True, cache_size=2)
+        
+        generator.generate(intent="greeting")
+        generator.generate(intent="goodbye")
+        generator.generate(intent="greeting")
+        generator.generate(intent="unknown")
+        
+        assert list(generator.cache) == ["greeting", "unknown"]
+    
+    def test_cache_normalizes_entities(self):
+        """Test entity case/spacing variants hit the same cache entry"""
+        generator = ResponseGenerator(enable_cache=True)
+        
+        generator.generate(intent="request_scenario", entities={"scenario": "Restaurant"})
+        generator.generate(intent="request_scenario", entities={"scenario": " restaurant "})
+        
+        assert generator.stats["cache_hits"] == 1
+    
     def test_add_template(self):
         """Test adding custom template"""
         generator = ResponseGenerator()
@@ -0,0 +1,100 @@
+"""Tests for speech-to-text modules"""
+
+import types
+import pytest
+import numpy as np
+from src.stt.mel import MelFeatureExtractor
+
+
+def _make_base():
+    """Stand-in for faster-whisper's FeatureExtractor parameters"""
+    rng = np.random.default_rng(0)
+    return types.SimpleNamespace(
+        n_fft=400,
+        hop_length=160,
+        sampling_rate=16000,
+        n_samples=480000,
+        nb_max_frames=3000,
+        mel_filters=(np.abs(rng.standard_normal((80, 201))) * 0.05).astype(np.float32)
+    )
+
+
+def _reference_log_mel(base, waveform, padding=True):
+    """Whisper log-mel (torch.stft, center=True) one frame at a time in float64"""
+    if padding:
+        waveform = np.pad(waveform, (0, base.n_samples))
+    
+    hop = base.hop_length
+    signal = np.pad(waveform.astype(np.float64), base.n_fft // 2, mode="reflect")
+    window = np.hanning(base.n_fft + 1)[:-1]
+    
+    # torch.stft yields one frame more; Whisper drops the last
+    num_frames = waveform.shape[0] // hop
+    power = np.stack([
+        np.abs(np.fft.rfft(signal[i * hop:i * hop + base.n_fft] * window)) ** 2
+        for i in range(num_frames)
+    ], axis=1)
+    
+    log_spec = np.log10(np.maximum(base.mel_filters @ power, 1e-10))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+
+class TestMelFeatureExtractor:
+    """Test MelFeatureExtractor class"""
+    
+    @pytest.mark.parametrize("num_samples", [1000, 16000, 16123])
+    def test_matches_reference(self, num_samples):
+        """Test padded features match the per-frame reference"""
+        base = _make_base()
+        audio = (np.random.default_rng(1).standard_normal(num_samples) * 0.1).astype(np.float32)
+        
+        features = MelFeatureExtractor(base)(audio)
+        
+        assert features.dtype == np.float32
+        assert features.shape == (80, (num_samples + base.n_samples) // base.hop_length)
+        np.testing.assert_allclose(features, _reference_log_mel(base, audio), atol=1e-5)
+    
+    def test_short_input(self):
+        """Test input shorter than half a window (partial front reflection)"""
+        base = _make_base()
+        audio = (np.random.default_rng(2).standard_normal(150) * 0.1).astype(np.float32)
+        
+        np.testing.assert_allclose(
+            MelFeatureExtractor(base)(audio), _reference_log_mel(base, audio), atol=1e-5
+        )
+    
+    def test_without_padding(self):
+        """Test unpadded input reflects both ends like torch.stft"""
+        base = _make_base()
+        audio = (np.random.default_rng(3).standard_normal(4000) * 0.1).astype(np.float32)
+        
+        features = MelFeatureExtractor(base)(audio, padding=False)
+        
+        assert features.shape == (80, 25)
+        np.testing.assert_allclose(
+            features, _reference_log_mel(base, audio, padding=False), atol=1e-5
+        )
+    
+    def test_empty_waveform(self):
+        """Test empty input"""
+        base = _make_base()
+        extractor = MelFeatureExtractor(base)
+        empty = np.zeros(0, dtype=np.float32)
+        
+        assert extractor(empty, padding=False).shape == (80, 0)
+        np.testing.assert_allclose(extractor(empty), _reference_log_mel(base, empty), atol=1e-5)
+    
+    def test_matches_faster_whisper(self):
+        """Test against faster-whisper's own FeatureExtractor"""
+        feature_extractor = pytest.importorskip("faster_whisper.feature_extractor")
+        base = feature_extractor.FeatureExtractor()
+        audio = (np.random.default_rng(4).standard_normal(16000) * 0.1).astype(np.float32)
+        
+        expected = base(audio)
+        
+        np.testing.assert_allclose(MelFeatureExtractor(base)(audio), expected, atol=1e-5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])